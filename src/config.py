@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 import os
 import aio_pika
-from typing import Optional
+from typing import Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -109,17 +109,20 @@ async def setup_message_queues():
 
 
 # Message publishing utilities
-async def publish_message(routing_key: str, message_body: dict, exchange_name: str = "comako_exchange"):
+async def publish_message(routing_key: str, message_body: Union[dict, bytes], exchange_name: str = "comako_exchange"):
     """
     Publish a message to RabbitMQ.
     
     Args:
         routing_key: Routing key for message routing
-        message_body: Message payload as dictionary
+        message_body: Message payload as dictionary, or as already serialized JSON bytes
         exchange_name: Exchange to publish to
     """
     import json
     
+    if not isinstance(message_body, bytes):
+        message_body = json.dumps(message_body).encode()
+    
     try:
         connection = await get_rabbit_connection()
         channel = await connection.channel()
@@ -127,7 +130,7 @@ async def publish_message(routing_key: str, message_body: dict, exchange_name: s
         exchange = await channel.get_exchange(exchange_name)
         
         message = aio_pika.Message(
-            body=json.dumps(message_body).encode(),
+            body=message_body,
             content_type="application/json",
             delivery_mode=aio_pika.DeliveryMode.PERSISTENT
         )
@@ -55,6 +55,22 @@ class AS2Certificate:
         Returns:
             True if successful, False otherwise
         """
+        return self._load_sync()
+    
+    async def load_certificate_async(self) -> bool:
+        """
+        Load certificate and private key without blocking the event loop.
+        
+        The file reads are offloaded to the default executor so that slow
+        storage does not stall other coroutines.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self._load_sync)
+    
+    def _load_sync(self) -> bool:
+        """Blocking certificate/key loader used by both load variants."""
         try:
             # In a real implementation, use cryptography library
             # For demo purposes, we'll simulate certificate loading
@@ -196,7 +212,7 @@ class AS2Server:
             True if started successfully
         """
         try:
-            if not self.certificate.load_certificate():
+            if not await self.certificate.load_certificate_async():
                 raise AS2Error("Failed to load AS2 certificate")
             
             # In a real implementation, start HTTP server here
@@ -243,8 +259,7 @@ class AS2Server:
             )
             
             # Add received headers
-            for key, value in headers.items():
-                message.add_header(key, value)
+            message.headers.update(headers)
             
             # Validate message (simplified)
             if not self._validate_message(message):
@@ -377,7 +392,7 @@ class AS2Client:
         """
         try:
             # Load certificate if not already loaded
-            if not self.certificate.load_certificate():
+            if not await self.certificate.load_certificate_async():
                 raise AS2Error("Failed to load AS2 certificate")
             
             # Generate message ID
@@ -1,7 +1,12 @@
+from sqlalchemy import delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm.interfaces import LoaderOption
 from src.models.models import BalanceGroup, BalanceGroupMember, MarketParticipant
-from typing import List, Optional
+from typing import List, Optional, Sequence
+
+# Rows per executemany batch in add_members_bulk
+BULK_INSERT_BATCH_SIZE = 500
 
 class BalanceGroupRepository:
     def __init__(self, session: AsyncSession):
@@ -40,26 +45,66 @@ class BalanceGroupRepository:
         await self.session.refresh(member)
         return member
 
+    async def add_members_bulk(self, balance_group_id: str, participant_ids: List[str]) -> List[str]:
+        """Add many market participants to a balance group in one transaction.
+
+        Unknown participants and existing memberships are skipped. Returns the
+        IDs of the participants that were added.
+        """
+        if not participant_ids or not await self.get_balance_group(balance_group_id):
+            return []
+
+        # One existence check: known participants that are not yet members
+        result = await self.session.execute(
+            select(MarketParticipant.id).where(
+                MarketParticipant.id.in_(set(participant_ids)),
+                MarketParticipant.id.not_in(
+                    select(BalanceGroupMember.market_participant_id)
+                    .where(BalanceGroupMember.balance_group_id == balance_group_id)
+                )
+            )
+        )
+        addable = set(result.scalars().all())
+        added = [pid for pid in dict.fromkeys(participant_ids) if pid in addable]
+
+        for start in range(0, len(added), BULK_INSERT_BATCH_SIZE):
+            await self.session.execute(
+                insert(BalanceGroupMember),
+                [
+                    {"balance_group_id": balance_group_id, "market_participant_id": pid}
+                    for pid in added[start:start + BULK_INSERT_BATCH_SIZE]
+                ]
+            )
+        await self.session.commit()
+        return added
+
     async def remove_member(self, balance_group_id: str, participant_id: str) -> bool:
         """Remove a market participant from a balance group"""
         result = await self.session.execute(
-            select(BalanceGroupMember).where(
+            delete(BalanceGroupMember)
+            .where(
                 BalanceGroupMember.balance_group_id == balance_group_id,
                 BalanceGroupMember.market_participant_id == participant_id
             )
+            .returning(BalanceGroupMember.market_participant_id)
         )
-        member = result.scalar_one_or_none()
-        if member:
-            await self.session.delete(member)
-            await self.session.commit()
-            return True
-        return False
+        removed = result.first() is not None
+        await self.session.commit()
+        return removed
+
+    async def get_members(
+        self, balance_group_id: str, options: Sequence[LoaderOption] = ()
+    ) -> List[MarketParticipant]:
+        """Get all members of a balance group
 
-    async def get_members(self, balance_group_id: str) -> List[MarketParticipant]:
-        """Get all members of a balance group"""
+        Relationships the caller will touch should be eager-loaded through
+        ``options``, e.g. ``[selectinload(MarketParticipant.metering_points)]``;
+        each adds one batched SELECT instead of a lazy load per member.
+        """
         result = await self.session.execute(
             select(MarketParticipant)
             .join(BalanceGroupMember)
             .where(BalanceGroupMember.balance_group_id == balance_group_id)
+            .options(*options)
         )
         return result.scalars().all()
@@ -1,5 +1,17 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import Dict, Any, Iterable, Mapping, Sequence, Union
+
+try:
+    import polars as pl
+except ImportError:  # Optional multi-threaded engine, pandas handles everything without it
+    pl = None
+
+# Readings/forecasts as row dicts (AoS) or as a mapping of column sequences (SoA)
+SeriesData = Union[Iterable[Dict[str, Any]], Mapping[str, Sequence[Any]]]
+
+# Below this many input rows the pandas path wins; frame conversion dominates
+POLARS_MIN_ROWS = 100_000
 
 def calculate_deviation(actual: float, forecast: float) -> float:
     """
@@ -29,32 +41,199 @@ def calculate_deviation_percentage(actual: float, forecast: float) -> float:
         return 0.0 if actual == 0 else float('inf') if actual > 0 else float('-inf')
     return ((actual - forecast) / forecast) * 100
 
+def calculate_deviation_percentage_array(actual: np.ndarray, forecast: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_deviation_percentage for arrays of values.
+    
+    Args:
+        actual: Actual energy values in kWh
+        forecast: Forecasted energy values in kWh, same shape as actual
+        
+    Returns:
+        Deviations as percentages of forecast; zero forecasts map to 0, inf or -inf
+        exactly like the scalar function
+    """
+    actual = np.asarray(actual, dtype=np.float64)
+    forecast = np.asarray(forecast, dtype=np.float64)
+    zero = forecast == 0
+    out = np.zeros(np.broadcast(actual, forecast).shape, dtype=np.float64)
+    np.divide(actual - forecast, forecast, out=out, where=~zero)
+    out *= 100
+    out[zero & (actual > 0)] = np.inf
+    out[zero & (actual < 0)] = -np.inf
+    return out
+
 class DeviationAnalyzer:
     """
     Analyzes deviations for a portfolio of metering points over time.
     """
-    def __init__(self, readings_data: List[Dict[str, Any]], forecast_data: List[Dict[str, Any]]):
+    def __init__(self, readings_data: SeriesData, forecast_data: SeriesData):
         """
         Initializes the analyzer with readings and forecast data.
 
         Args:
-            readings_data: A list of dictionaries, each representing a meter reading.
+            readings_data: An iterable of dictionaries, each representing a meter reading.
                            Expected keys: 'metering_point_id', 'timestamp', 'value_kwh'.
-            forecast_data: A list of dictionaries, each representing a forecast.
+            forecast_data: An iterable of dictionaries, each representing a forecast.
                            Expected keys: 'metering_point_id', 'timestamp', 'value_kwh'.
+
+            Either argument may instead be a mapping of those keys to equal-length
+            column sequences, which skips the per-row transpose. Arrow tables go
+            through from_arrow.
         """
-        self.readings_df = self._prepare_data(readings_data)
-        self.forecast_df = self._prepare_data(forecast_data)
+        self._init_state(self._prepare_data(readings_data), self._prepare_data(forecast_data))
+
+    def _init_state(self, readings_df: pd.DataFrame, forecast_df: pd.DataFrame) -> None:
+        """Sets the input frames and empties the result caches."""
+        self._input_version = 0
+        self._merged_version = -1
+        self._meter_deviation = None
+        self._meter_version = -1
+        self.readings_df = readings_df
+        self.forecast_df = forecast_df
         self.merged_df = pd.DataFrame()
 
-    def _prepare_data(self, data: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Converts raw data into a pandas DataFrame with a datetime index."""
-        if not data:
-            return pd.DataFrame(columns=['metering_point_id', 'value_kwh']).set_index(pd.to_datetime([]))
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.set_index('timestamp')
-        return df
+    # Results are cached per input version; assigning either frame invalidates
+    # them, in-place edits of a frame do not
+    @property
+    def readings_df(self) -> pd.DataFrame:
+        return self._readings_df
+
+    @readings_df.setter
+    def readings_df(self, df: pd.DataFrame) -> None:
+        self._readings_df = df
+        self._input_version += 1
+
+    @property
+    def forecast_df(self) -> pd.DataFrame:
+        return self._forecast_df
+
+    @forecast_df.setter
+    def forecast_df(self, df: pd.DataFrame) -> None:
+        self._forecast_df = df
+        self._input_version += 1
+
+    @classmethod
+    def from_arrow(cls, readings_table: Any, forecast_table: Any) -> "DeviationAnalyzer":
+        """
+        Builds an analyzer straight from Arrow tables, without Python row objects.
+
+        Args:
+            readings_table: pyarrow.Table with 'metering_point_id', 'timestamp'
+                            (timestamp or ISO 8601 string) and 'value_kwh' columns.
+            forecast_table: pyarrow.Table with the same columns.
+
+        Returns:
+            A DeviationAnalyzer over the two tables.
+        """
+        analyzer = cls.__new__(cls)
+        analyzer._init_state(cls._frame_from_arrow(readings_table), cls._frame_from_arrow(forecast_table))
+        return analyzer
+
+    def _prepare_data(self, data: SeriesData) -> pd.DataFrame:
+        """
+        Converts raw data into a pandas DataFrame indexed by a sorted
+        (metering_point_id, timestamp) MultiIndex.
+        """
+        if isinstance(data, Mapping):
+            ids = data['metering_point_id']
+            timestamps = data['timestamp']
+            values = data['value_kwh']
+        else:
+            # Generators and other one-shot iterables are materialized once
+            rows = data if isinstance(data, Sequence) else list(data)
+            ids = [d['metering_point_id'] for d in rows]
+            timestamps = [d['timestamp'] for d in rows]
+            values = [d['value_kwh'] for d in rows]
+
+        return self._build_frame(pd.Categorical(ids), timestamps, values)
+
+    @staticmethod
+    def _frame_from_arrow(table: Any) -> pd.DataFrame:
+        """Converts an Arrow table into the frame layout used by _prepare_data."""
+        ids = table.column('metering_point_id')
+        if not hasattr(ids.type, 'index_type'):
+            ids = ids.dictionary_encode()
+        # Dictionary-encoded columns arrive as categoricals; sort the categories
+        # so the index layout matches frames built by _prepare_data
+        categories = pd.Categorical(ids.to_pandas())
+        categories = categories.reorder_categories(categories.categories.sort_values())
+        return DeviationAnalyzer._build_frame(
+            categories,
+            table.column('timestamp').to_pandas(),
+            table.column('value_kwh').to_numpy()
+        )
+
+    @staticmethod
+    def _build_frame(ids: pd.Categorical, timestamps: Any, values: Any) -> pd.DataFrame:
+        """Builds the analyzer frame from meter ID, timestamp and value columns."""
+        # Build typed columns directly; timestamps are parsed in one vectorized pass.
+        # Categorical IDs let pandas group on integer codes instead of hashing strings.
+        # The sorted key index lets readings and forecasts align without a hash join.
+        index = pd.MultiIndex.from_arrays(
+            [
+                ids,
+                DeviationAnalyzer._parse_timestamps(timestamps),
+            ],
+            names=['metering_point_id', 'timestamp']
+        )
+        return pd.DataFrame(
+            {'value_kwh': np.asarray(values, dtype=np.float64)},
+            index=index
+        ).sort_index()
+
+    @staticmethod
+    def _parse_timestamps(timestamps: Any) -> Any:
+        """
+        Parses timestamps in one vectorized pass. Naive timestamps stay naive
+        and a single UTC offset is kept; only inputs mixing offsets, or naive
+        with aware timestamps, are converted to UTC.
+        """
+        try:
+            return pd.to_datetime(timestamps, format='ISO8601', cache=True)
+        except (ValueError, TypeError):
+            return pd.to_datetime(timestamps, utc=True, format='ISO8601', cache=True)
+
+    def _use_polars(self) -> bool:
+        """Whether the inputs are large enough to hand off to Polars."""
+        return pl is not None and len(self.readings_df) + len(self.forecast_df) >= POLARS_MIN_ROWS
+
+    @staticmethod
+    def _to_lazy(df: pd.DataFrame) -> "pl.LazyFrame":
+        """Exposes a prepared frame's values to Polars; aware timestamps as naive UTC."""
+        timestamps = df.index.get_level_values('timestamp')
+        if timestamps.tz is not None:
+            timestamps = timestamps.tz_convert(None)
+        return pl.LazyFrame({
+            'timestamp': timestamps.as_unit('us').to_numpy(),
+            'value_kwh': df['value_kwh'].to_numpy(),
+        })
+
+    def _portfolio_deviation_polars(self) -> pd.DataFrame:
+        """Polars variant of calculate_portfolio_deviation."""
+        actuals = self._to_lazy(self.readings_df).group_by('timestamp').agg(
+            pl.col('value_kwh').sum().alias('actual_kwh')
+        )
+        forecasts = self._to_lazy(self.forecast_df).group_by('timestamp').agg(
+            pl.col('value_kwh').sum().alias('forecast_kwh')
+        )
+        out = (
+            actuals.join(forecasts, on='timestamp', how='full', coalesce=True)
+            .fill_null(0)
+            .with_columns((pl.col('actual_kwh') - pl.col('forecast_kwh')).alias('deviation_kwh'))
+            .sort('timestamp')
+            .collect()
+        )
+        index = pd.DatetimeIndex(out['timestamp'].to_numpy(), name='timestamp')
+        # Restore the inputs' timezone; naive inputs give a naive index
+        source = self.readings_df if len(self.readings_df) else self.forecast_df
+        tz = source.index.get_level_values('timestamp').tz
+        if tz is not None:
+            index = index.tz_localize('UTC').tz_convert(tz)
+        return pd.DataFrame(
+            {column: out[column].to_numpy() for column in ('actual_kwh', 'forecast_kwh', 'deviation_kwh')},
+            index=index
+        )
 
     def calculate_portfolio_deviation(self) -> pd.DataFrame:
         """
@@ -62,18 +241,46 @@ class DeviationAnalyzer:
 
         Returns:
             A pandas DataFrame with the aggregated actuals, forecasts, and deviations.
+            The frame is computed once per set of inputs; each call returns a copy.
         """
+        if self._merged_version == self._input_version:
+            return self.merged_df.copy()
+
+        if self._use_polars():
+            self.merged_df = self._portfolio_deviation_polars()
+            self._merged_version = self._input_version
+            return self.merged_df.copy()
+
         # Aggregate readings and forecasts by timestamp
-        actuals_agg = self.readings_df.groupby('timestamp')['value_kwh'].sum()
-        forecast_agg = self.forecast_df.groupby('timestamp')['value_kwh'].sum()
+        actuals_agg = self.readings_df.groupby(level='timestamp', sort=False)['value_kwh'].sum()
+        forecast_agg = self.forecast_df.groupby(level='timestamp', sort=False)['value_kwh'].sum()
 
-        # Merge aggregated data
-        self.merged_df = pd.DataFrame({'actual_kwh': actuals_agg, 'forecast_kwh': forecast_agg}).fillna(0)
-        
-        # Calculate deviation
-        self.merged_df['deviation_kwh'] = self.merged_df['actual_kwh'] - self.merged_df['forecast_kwh']
+        # Align both series on the sorted union of timestamps and subtract as arrays;
+        # union returns an equal left index as is, in first-seen order
+        index = actuals_agg.index.union(forecast_agg.index)
+        if not index.is_monotonic_increasing:
+            index = index.sort_values()
+        actual = actuals_agg.reindex(index, fill_value=0).to_numpy(dtype=np.float64)
+        forecast = forecast_agg.reindex(index, fill_value=0).to_numpy(dtype=np.float64)
+
+        self.merged_df = pd.DataFrame(
+            {'actual_kwh': actual, 'forecast_kwh': forecast, 'deviation_kwh': actual - forecast},
+            index=index
+        )
+        self._merged_version = self._input_version
         
-        return self.merged_df
+        return self.merged_df.copy()
+
+    def _deviation_by_meter(self) -> pd.Series:
+        """Total absolute deviation per metering point, cached per set of inputs."""
+        if self._meter_version != self._input_version:
+            # Align readings and forecasts on their sorted (meter, timestamp) index
+            deviation = self.readings_df['value_kwh'].subtract(self.forecast_df['value_kwh'], fill_value=0)
+
+            # Sum absolute deviation per metering point
+            self._meter_deviation = deviation.abs().groupby(level='metering_point_id', observed=True).sum()
+            self._meter_version = self._input_version
+        return self._meter_deviation
 
     def get_top_contributors(self, n: int = 5) -> Dict[str, float]:
         """
@@ -85,22 +292,18 @@ class DeviationAnalyzer:
         Returns:
             A dictionary with metering point IDs and their total deviation in kWh.
         """
-        # Merge individual readings and forecasts
-        individual_df = pd.merge(
-            self.readings_df,
-            self.forecast_df,
-            on=['timestamp', 'metering_point_id'],
-            suffixes=('_actual', '_forecast'),
-            how='outer'
-        ).fillna(0)
-
-        # Calculate individual deviation
-        individual_df['deviation_kwh'] = individual_df['value_kwh_actual'] - individual_df['value_kwh_forecast']
-        
-        # Sum absolute deviation per metering point
-        deviation_by_meter = individual_df.groupby('metering_point_id')['deviation_kwh'].apply(lambda x: x.abs().sum())
+        deviation_by_meter = self._deviation_by_meter()
         
-        # Get top N contributors
-        top_contributors = deviation_by_meter.nlargest(n)
+        # Get top N contributors; partial selection is O(N) when n is small
+        values = deviation_by_meter.to_numpy()
+        if 0 < n < len(values) and not np.isnan(values).any():
+            # Keep every meter tied with the n-th largest value, then order by
+            # value and meter position like nlargest(keep='first')
+            kth = np.partition(values, len(values) - n)[len(values) - n]
+            idx = np.flatnonzero(values >= kth)
+            idx = idx[np.lexsort((idx, -values[idx]))[:n]]
+            top_contributors = deviation_by_meter.iloc[idx]
+        else:
+            top_contributors = deviation_by_meter.nlargest(n)
         
         return top_contributors.to_dict()
@@ -16,29 +16,121 @@ Supports:
 """
 
 import os
+import copy
+import functools
+import itertools
 import logging
-import xml.etree.ElementTree as ET
-from typing import Dict, Any, Optional, List, Union
-from datetime import datetime, date
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Union
+from datetime import datetime, date, timedelta
 from decimal import Decimal
-import uuid
-import base64
 from pathlib import Path
-import tempfile
+from types import SimpleNamespace
 
-# Note: In a real implementation, you would use proper XML libraries
-# and PDF generation libraries like reportlab or weasyprint
+from lxml import etree as ET
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON writer, stdlib json is used without it
+    orjson = None
+
+# Note: In a real implementation, you would use proper PDF generation
+# libraries like reportlab or weasyprint
 logger = logging.getLogger(__name__)
 
+# CII namespaces used by XRechnung documents
+RSM_NS = "urn:un:unece:uncefact:data:standard:CrossIndustryInvoice:100"
+RAM_NS = "urn:un:unece:uncefact:data:standard:ReusableAggregateBusinessInformationEntity:100"
+UDT_NS = "urn:un:unece:uncefact:data:standard:UnqualifiedDataType:100"
+
+# Only the namespaces the generated documents actually use are declared
+XRECHNUNG_NSMAP = {"rsm": RSM_NS, "ram": RAM_NS, "udt": UDT_NS}
+
+# Decimal constants for the amount arithmetic, built once instead of per call
+_CENT = Decimal('0.01')
+_HUNDRED = Decimal('100')
+_ZERO = Decimal('0.00')
+_ONE = Decimal('1')
+
+
+# Clark-notation prefixes for building qualified tag names, e.g. _T.ID
+_RSM = f"{{{RSM_NS}}}"
+_RAM = f"{{{RAM_NS}}}"
+_UDT = f"{{{UDT_NS}}}"
+
+# Qualified tag names, precomputed once and looked up as _T.<local name>
+_T = SimpleNamespace(**{
+    local: prefix + local
+    for prefix, locals_ in (
+        (_RSM, (
+            "CrossIndustryInvoice", "SupplyChainTradeTransaction", "ExchangedDocumentContext",
+            "ExchangedDocument",
+        )),
+        (_RAM, (
+            "ID", "BusinessProcessSpecifiedDocumentContextParameter",
+            "GuidelineSpecifiedDocumentContextParameter", "TypeCode", "IssueDateTime",
+            "ApplicableHeaderTradeAgreement", "SellerTradeParty", "BuyerTradeParty",
+            "ApplicableHeaderTradeDelivery", "ApplicableHeaderTradeSettlement", "InvoiceCurrencyCode",
+            "SpecifiedTradeSettlementHeaderMonetarySummation", "LineTotalAmount", "TaxBasisTotalAmount",
+            "TaxTotalAmount", "GrandTotalAmount", "DuePayableAmount", "SpecifiedTradePaymentTerms",
+            "Description", "DueDateDateTime", "Name", "PostalTradeAddress", "PostcodeCode", "LineOne",
+            "LineTwo", "CityName", "CountryID", "SpecifiedTaxRegistration",
+            "IncludedSupplyChainTradeLineItem", "AssociatedDocumentLineDocument", "LineID",
+            "SpecifiedTradeProduct", "SpecifiedLineTradeAgreement", "NetPriceProductTradePrice",
+            "ChargeAmount", "SpecifiedLineTradeDelivery", "BilledQuantity",
+            "SpecifiedLineTradeSettlement", "ApplicableTradeTax", "CategoryCode",
+            "RateApplicablePercent", "SpecifiedTradeSettlementLineMonetarySummation",
+            "CalculatedAmount", "BasisAmount",
+        )),
+        (_UDT, (
+            "DateTimeString",
+        )),
+    )
+    for local in locals_
+})
+
+# Leaf elements of a line item subtree, in document order
+_LINE_ITEM_LEAVES = (
+    _T.LineID, _T.Name, _T.ChargeAmount, _T.BilledQuantity,
+    _T.TypeCode, _T.CategoryCode, _T.RateApplicablePercent, _T.LineTotalAmount
+)
+
+
+# Serialized root start and end tags, e.g. b'<rsm:CrossIndustryInvoice xmlns:rsm="..." ...>',
+# and the namespace declarations between them. Sections are built with the same
+# declarations so they serialize on their own; write_xml strips them again so
+# only the root declares namespaces, as in generate_xml_bytes.
+_EMPTY_ROOT = ET.tostring(ET.Element(_T.CrossIndustryInvoice, nsmap=XRECHNUNG_NSMAP))
+_ROOT_START = _EMPTY_ROOT[:-2] + b">"
+_ROOT_END = b"</" + _EMPTY_ROOT[1:_EMPTY_ROOT.index(b" ")] + b">"
+_NS_DECLARATIONS = _EMPTY_ROOT[_EMPTY_ROOT.index(b" "):-2]
+_TRANSACTION_START = b"<rsm:SupplyChainTradeTransaction>"
+_TRANSACTION_END = b"</rsm:SupplyChainTradeTransaction>"
+
 
 class EInvoiceError(Exception):
     """Custom exception for E-Invoice operations."""
     pass
 
 
+# Parser for invoice documents handed to validate_xml; no entity expansion or
+# network access
+_VALIDATION_PARSER = ET.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_schema(schema_path: str) -> ET.XMLSchema:
+    """Compile an XSD once per path; schema imports resolve relative to it."""
+    try:
+        return ET.XMLSchema(ET.parse(schema_path))
+    except (OSError, ET.XMLSchemaParseError, ET.XMLSyntaxError) as e:
+        raise EInvoiceError(f"Cannot load XRechnung schema {schema_path}: {e}") from e
+
+
 class TaxInfo:
     """Tax information for invoice line items."""
     
+    __slots__ = ("_tax_rate", "_rate_fraction", "rate_key", "tax_category", "tax_scheme")
+    
     def __init__(
         self,
         tax_rate: Decimal,
@@ -57,14 +149,35 @@ class TaxInfo:
         self.tax_category = tax_category
         self.tax_scheme = tax_scheme
     
+    @property
+    def tax_rate(self) -> Decimal:
+        """Tax rate as percentage."""
+        return self._tax_rate
+    
+    @tax_rate.setter
+    def tax_rate(self, value: Decimal) -> None:
+        self._tax_rate = value
+        # Dividing by 100 only shifts the exponent, so this is exact
+        self._rate_fraction = value / _HUNDRED
+        # Rate as text; groups line items in EInvoice.get_tax_breakdown and is
+        # written as-is to the XML
+        self.rate_key = str(value)
+    
     def calculate_tax_amount(self, net_amount: Decimal) -> Decimal:
         """Calculate tax amount from net amount."""
-        return (net_amount * self.tax_rate / Decimal('100')).quantize(Decimal('0.01'))
+        return (net_amount * self._rate_fraction).quantize(_CENT)
 
 
 class InvoiceLineItem:
     """Individual line item in an invoice."""
     
+    # Thousands of these exist per settlement run; slots drop the per-instance dict
+    __slots__ = (
+        "line_id", "description", "quantity", "unit", "unit_price", "tax_info",
+        "period_start", "period_end", "metering_point_id",
+        "net_amount", "tax_amount", "gross_amount"
+    )
+    
     def __init__(
         self,
         line_id: str,
@@ -102,7 +215,7 @@ class InvoiceLineItem:
         self.metering_point_id = metering_point_id
         
         # Calculate amounts
-        self.net_amount = (quantity * unit_price).quantize(Decimal('0.01'))
+        self.net_amount = (quantity * unit_price).quantize(_CENT)
         self.tax_amount = tax_info.calculate_tax_amount(self.net_amount)
         self.gross_amount = self.net_amount + self.tax_amount
     
@@ -127,6 +240,11 @@ class InvoiceLineItem:
 class PartyInfo:
     """Party information (buyer/seller) for invoices."""
     
+    __slots__ = (
+        "name", "address_line1", "address_line2", "postal_code", "city", "country_code",
+        "tax_number", "vat_id", "email", "phone", "registration_name"
+    )
+    
     def __init__(
         self,
         name: str,
@@ -170,6 +288,29 @@ class PartyInfo:
         self.registration_name = registration_name or name
 
 
+class _InvoiceStatistics:
+    """Invoice counts and gross amounts per invoice type, kept by EInvoiceManager."""
+    
+    __slots__ = ("count", "count_by_type", "amount_by_type")
+    
+    def __init__(self):
+        self.count = 0
+        self.count_by_type: Dict[str, int] = {}
+        self.amount_by_type: Dict[str, Decimal] = {}
+    
+    def add_invoice(self, invoice: "EInvoice") -> None:
+        """Count an invoice and follow changes to its gross total from now on."""
+        invoice_type = invoice.invoice_type
+        self.count += 1
+        self.count_by_type[invoice_type] = self.count_by_type.get(invoice_type, 0) + 1
+        self.add_amount(invoice_type, invoice.total_gross_amount)
+        invoice._statistics = self
+    
+    def add_amount(self, invoice_type: str, amount: Decimal) -> None:
+        """Add to the gross amount of an invoice type."""
+        self.amount_by_type[invoice_type] = self.amount_by_type.get(invoice_type, _ZERO) + amount
+
+
 class EInvoice:
     """
     Electronic invoice according to German E-Rechnung standards.
@@ -178,6 +319,13 @@ class EInvoice:
     with EU Directive 2014/55/EU.
     """
     
+    __slots__ = (
+        "invoice_number", "invoice_date", "due_date", "seller", "buyer", "invoice_type",
+        "currency", "payment_terms", "reference_number", "_line_items", "created_at",
+        "_total_net_amount", "_total_tax_amount", "_total_gross_amount",
+        "_totals_dirty", "_totals_items", "_tax_breakdown", "_statistics"
+    )
+    
     def __init__(
         self,
         invoice_number: str,
@@ -214,44 +362,169 @@ class EInvoice:
         self.payment_terms = payment_terms
         self.reference_number = reference_number
         
-        self.line_items: List[InvoiceLineItem] = []
+        self._line_items: List[InvoiceLineItem] = []
         self.created_at = datetime.now()
         
-        # Totals (calculated when line items are added)
-        self.total_net_amount = Decimal('0.00')
-        self.total_tax_amount = Decimal('0.00')
-        self.total_gross_amount = Decimal('0.00')
+        # Totals and tax breakdown are computed on first access after the
+        # line items change. Each keeps the items it was computed from, so
+        # items added, removed or replaced on the list itself are noticed.
+        self._total_net_amount = _ZERO
+        self._total_tax_amount = _ZERO
+        self._total_gross_amount = _ZERO
+        self._totals_dirty = False
+        self._totals_items: List[InvoiceLineItem] = []
+        # (breakdown, items, (tax info, rate key) pairs it was grouped by)
+        self._tax_breakdown: Optional[tuple] = None
+        # Running statistics of the manager that created this invoice
+        self._statistics: Optional[_InvoiceStatistics] = None
+    
+    def __getstate__(self):
+        # A copy does not count towards the creating manager's statistics
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["_statistics"] = None
+        return None, state
+    
+    @property
+    def line_items(self) -> List[InvoiceLineItem]:
+        """Invoice line items."""
+        return self._line_items
+    
+    @line_items.setter
+    def line_items(self, line_items: Iterable[InvoiceLineItem]) -> None:
+        self._line_items = list(line_items)
+        self._line_items_changed()
+    
+    def _line_items_changed(self) -> None:
+        """Drop the cached totals and tax breakdown."""
+        self._tax_breakdown = None
+        if self._statistics is not None:
+            # Keep the manager's statistics current
+            self._recalculate_totals()
+        else:
+            self._totals_dirty = True
+    
+    def _set_gross_amount(self, value: Decimal) -> None:
+        """Set the gross total, passing the change on to the statistics."""
+        if self._statistics is not None:
+            self._statistics.add_amount(self.invoice_type, value - self._total_gross_amount)
+        self._total_gross_amount = value
+    
+    def _totals_stale(self) -> bool:
+        """Whether the cached totals no longer match the line items."""
+        # Line items compare by identity, so a replaced item is a change
+        return self._totals_dirty or self._totals_items != self._line_items
+    
+    @property
+    def total_net_amount(self) -> Decimal:
+        """Sum of line item net amounts."""
+        if self._totals_stale():
+            self._recalculate_totals()
+        return self._total_net_amount
+    
+    @total_net_amount.setter
+    def total_net_amount(self, value: Decimal) -> None:
+        if self._totals_stale():
+            self._recalculate_totals()
+        self._total_net_amount = value
+    
+    @property
+    def total_tax_amount(self) -> Decimal:
+        """Sum of line item tax amounts."""
+        if self._totals_stale():
+            self._recalculate_totals()
+        return self._total_tax_amount
+    
+    @total_tax_amount.setter
+    def total_tax_amount(self, value: Decimal) -> None:
+        if self._totals_stale():
+            self._recalculate_totals()
+        self._total_tax_amount = value
+    
+    @property
+    def total_gross_amount(self) -> Decimal:
+        """Net plus tax total."""
+        if self._totals_stale():
+            self._recalculate_totals()
+        return self._total_gross_amount
+    
+    @total_gross_amount.setter
+    def total_gross_amount(self, value: Decimal) -> None:
+        if self._totals_stale():
+            self._recalculate_totals()
+        self._set_gross_amount(value)
     
     def add_line_item(self, line_item: InvoiceLineItem) -> None:
         """Add line item to invoice."""
-        self.line_items.append(line_item)
-        self._recalculate_totals()
+        # Up-to-date totals are adjusted in place instead of re-summed
+        stale = self._totals_stale()
+        self._line_items.append(line_item)
+        
+        if stale:
+            self._line_items_changed()
+        else:
+            self._tax_breakdown = None
+            self._total_net_amount += line_item.net_amount
+            self._total_tax_amount += line_item.tax_amount
+            self._set_gross_amount(self._total_net_amount + self._total_tax_amount)
+            self._totals_items.append(line_item)
+    
+    def add_line_items(self, line_items: Iterable[InvoiceLineItem]) -> None:
+        """Add several line items, recomputing totals once."""
+        self._line_items.extend(line_items)
+        self._line_items_changed()
     
     def _recalculate_totals(self) -> None:
         """Recalculate invoice totals."""
-        self.total_net_amount = sum(item.net_amount for item in self.line_items)
-        self.total_tax_amount = sum(item.tax_amount for item in self.line_items)
-        self.total_gross_amount = self.total_net_amount + self.total_tax_amount
+        # One pass accumulating both sums
+        net = tax = _ZERO
+        for item in self._line_items:
+            net += item.net_amount
+            tax += item.tax_amount
+        self._total_net_amount = net
+        self._total_tax_amount = tax
+        self._set_gross_amount(net + tax)
+        self._totals_dirty = False
+        self._totals_items = self._line_items[:]
     
-    def get_tax_breakdown(self) -> Dict[str, Dict[str, Decimal]]:
-        """Get tax breakdown by rate."""
-        tax_breakdown = {}
+    def _cached_tax_breakdown(self) -> Dict[str, Dict[str, Decimal]]:
+        """
+        Tax breakdown shared by to_dict and the XML generator; not to be modified.
+        
+        Cached until the line items change or one of their tax rates is
+        changed.
+        """
+        cached = self._tax_breakdown
+        if cached is not None:
+            tax_breakdown, items, rate_keys = cached
+            if items == self._line_items and all(tax_info.rate_key == rate_key for tax_info, rate_key in rate_keys):
+                return tax_breakdown
         
-        for item in self.line_items:
-            rate_key = str(item.tax_info.tax_rate)
-            if rate_key not in tax_breakdown:
-                tax_breakdown[rate_key] = {
-                    'rate': item.tax_info.tax_rate,
-                    'net_amount': Decimal('0.00'),
-                    'tax_amount': Decimal('0.00'),
-                    'category': item.tax_info.tax_category
+        tax_breakdown = {}
+        tax_infos = {}
+        
+        for item in self._line_items:
+            tax_info = item.tax_info
+            tax_infos[id(tax_info)] = tax_info
+            entry = tax_breakdown.get(tax_info.rate_key)
+            if entry is None:
+                entry = tax_breakdown[tax_info.rate_key] = {
+                    'rate': tax_info.tax_rate,
+                    'net_amount': _ZERO,
+                    'tax_amount': _ZERO,
+                    'category': tax_info.tax_category
                 }
             
-            tax_breakdown[rate_key]['net_amount'] += item.net_amount
-            tax_breakdown[rate_key]['tax_amount'] += item.tax_amount
+            entry['net_amount'] += item.net_amount
+            entry['tax_amount'] += item.tax_amount
         
+        rate_keys = tuple((tax_info, tax_info.rate_key) for tax_info in tax_infos.values())
+        self._tax_breakdown = (tax_breakdown, self._line_items[:], rate_keys)
         return tax_breakdown
     
+    def get_tax_breakdown(self) -> Dict[str, Dict[str, Decimal]]:
+        """Get tax breakdown by rate."""
+        return {rate: dict(entry) for rate, entry in self._cached_tax_breakdown().items()}
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert invoice to dictionary."""
         return {
@@ -285,7 +558,7 @@ class EInvoice:
                     "tax_amount": float(info["tax_amount"]),
                     "category": info["category"]
                 }
-                for rate, info in self.get_tax_breakdown().items()
+                for rate, info in self._cached_tax_breakdown().items()
             },
             "payment_terms": self.payment_terms,
             "reference_number": self.reference_number,
@@ -305,6 +578,9 @@ class XRechnungGenerator:
         """Initialize XRechnung generator."""
         self.customization_id = "urn:cen.eu:en16931:2017#compliant#urn:xeinkauf.de:kosit:xrechnung_3.0"
         self.profile_id = "urn:fdc:peppol.eu:2017:poacc:billing:01:1.0"
+        self._line_item_template = self._build_line_item_template()
+        self._context_template = self._build_context_template()
+        self._context_template_id = self.customization_id
     
     def generate_xml(self, invoice: EInvoice) -> str:
         """
@@ -316,163 +592,319 @@ class XRechnungGenerator:
         Returns:
             XRechnung XML string
         """
+        return self.generate_xml_bytes(invoice).decode("utf-8")
+    
+    def generate_xml_bytes(self, invoice: EInvoice) -> bytes:
+        """
+        Generate XRechnung XML as UTF-8 encoded bytes.
+        
+        Prefer this when the document is written or sent on, since lxml
+        serializes to bytes natively and no decode/re-encode is needed.
+        
+        Args:
+            invoice: Invoice to convert
+            
+        Returns:
+            XRechnung XML document bytes
+        """
         # Create root element with namespaces
-        root = ET.Element("rsm:CrossIndustryInvoice")
-        root.set("xmlns:rsm", "urn:un:unece:uncefact:data:standard:CrossIndustryInvoice:100")
-        root.set("xmlns:qdt", "urn:un:unece:uncefact:data:standard:QualifiedDataType:100")
-        root.set("xmlns:ram", "urn:un:unece:uncefact:data:standard:ReusableAggregateBusinessInformationEntity:100")
-        root.set("xmlns:xs", "http://www.w3.org/2001/XMLSchema")
-        root.set("xmlns:udt", "urn:un:unece:uncefact:data:standard:UnqualifiedDataType:100")
+        root = ET.Element(_T.CrossIndustryInvoice, nsmap=XRECHNUNG_NSMAP)
+        root.extend(self.header_sections(invoice))
+        
+        # Supply chain trade transaction
+        transaction = ET.SubElement(root, _T.SupplyChainTradeTransaction)
+        transaction.extend(self.iter_transaction_sections(invoice))
         
-        # Exchange document context
-        context = ET.SubElement(root, "rsm:ExchangedDocumentContext")
+        return ET.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8")
+    
+    def write_xml(self, invoice: EInvoice, filepath: Union[str, Path]) -> None:
+        """
+        Stream XRechnung XML to a file, one section at a time.
         
-        # Business process specified document context parameter
-        business_process = ET.SubElement(context, "ram:BusinessProcessSpecifiedDocumentContextParameter")
-        ET.SubElement(business_process, "ram:ID").text = "urn:fdc:peppol.eu:2017:poacc:billing:01:1.0"
+        Only the section being written is held in memory, so large invoices
+        never exist as a full tree or string. The file is byte-identical to
+        generate_xml_bytes' output.
         
-        # Guideline specified document context parameter
-        guideline = ET.SubElement(context, "ram:GuidelineSpecifiedDocumentContextParameter")
-        ET.SubElement(guideline, "ram:ID").text = self.customization_id
+        Args:
+            invoice: Invoice to convert
+            filepath: Target file path
+        """
+        with open(filepath, "wb") as f:
+            f.write(b"<?xml version='1.0' encoding='UTF-8'?>\n" + _ROOT_START)
+            for section in self.header_sections(invoice):
+                f.write(self._section_bytes(section, level=1))
+            f.write(b"\n  " + _TRANSACTION_START)
+            for section in self.iter_transaction_sections(invoice):
+                f.write(self._section_bytes(section, level=2))
+            f.write(b"\n  " + _TRANSACTION_END + b"\n" + _ROOT_END + b"\n")
+    
+    @staticmethod
+    def _section_bytes(section: ET.Element, level: int) -> bytes:
+        """Serialize one pretty-printed section at the given nesting level."""
+        ET.indent(section, space="  ", level=level)
+        # The section's namespace declarations open its start tag; the root
+        # already declares them
+        section_xml = ET.tostring(section, encoding="UTF-8", xml_declaration=False)
+        return b"\n" + b"  " * level + section_xml.replace(_NS_DECLARATIONS, b"", 1)
+    
+    def header_sections(self, invoice: EInvoice) -> List[ET.Element]:
+        """Build the document context and header sections."""
+        # Exchange document context is the same for every invoice; rebuild
+        # the cached copy only if the customization ID was changed
+        if self._context_template_id != self.customization_id:
+            self._context_template = self._build_context_template()
+            self._context_template_id = self.customization_id
+        context = copy.deepcopy(self._context_template)
         
         # Exchange document header
-        header = ET.SubElement(root, "rsm:ExchangedDocument")
-        ET.SubElement(header, "ram:ID").text = invoice.invoice_number
-        ET.SubElement(header, "ram:TypeCode").text = "380"  # Commercial invoice
+        header = ET.Element(_T.ExchangedDocument, nsmap=XRECHNUNG_NSMAP)
+        ET.SubElement(header, _T.ID).text = invoice.invoice_number
+        ET.SubElement(header, _T.TypeCode).text = "380"  # Commercial invoice
         
         # Issue date time
-        issue_datetime = ET.SubElement(header, "ram:IssueDateTime")
-        issue_date = ET.SubElement(issue_datetime, "udt:DateTimeString")
+        issue_datetime = ET.SubElement(header, _T.IssueDateTime)
+        issue_date = ET.SubElement(issue_datetime, _T.DateTimeString)
         issue_date.set("format", "102")
         issue_date.text = invoice.invoice_date.strftime("%Y%m%d")
         
-        # Supply chain trade transaction
-        transaction = ET.SubElement(root, "rsm:SupplyChainTradeTransaction")
+        return [context, header]
+    
+    def _build_context_template(self) -> ET.Element:
+        """Build the ExchangedDocumentContext section."""
+        context = ET.Element(_T.ExchangedDocumentContext, nsmap=XRECHNUNG_NSMAP)
+        
+        # Business process specified document context parameter
+        business_process = ET.SubElement(context, _T.BusinessProcessSpecifiedDocumentContextParameter)
+        ET.SubElement(business_process, _T.ID).text = "urn:fdc:peppol.eu:2017:poacc:billing:01:1.0"
         
-        # Add line items
+        # Guideline specified document context parameter
+        guideline = ET.SubElement(context, _T.GuidelineSpecifiedDocumentContextParameter)
+        ET.SubElement(guideline, _T.ID).text = self.customization_id
+        return context
+    
+    def iter_transaction_sections(self, invoice: EInvoice) -> Iterator[ET.Element]:
+        """Yield the children of SupplyChainTradeTransaction, line items first."""
+        # Line items
         for item in invoice.line_items:
-            self._add_line_item(transaction, item)
+            yield self._build_line_item(item)
         
         # Applicable header trade agreement
-        agreement = ET.SubElement(transaction, "ram:ApplicableHeaderTradeAgreement")
+        agreement = ET.Element(_T.ApplicableHeaderTradeAgreement, nsmap=XRECHNUNG_NSMAP)
         
         # Seller trade party
-        seller_party = ET.SubElement(agreement, "ram:SellerTradeParty")
+        seller_party = ET.SubElement(agreement, _T.SellerTradeParty)
         self._add_party_info(seller_party, invoice.seller, "seller")
         
         # Buyer trade party
-        buyer_party = ET.SubElement(agreement, "ram:BuyerTradeParty")
+        buyer_party = ET.SubElement(agreement, _T.BuyerTradeParty)
         self._add_party_info(buyer_party, invoice.buyer, "buyer")
+        yield agreement
         
         # Applicable header trade delivery
-        delivery = ET.SubElement(transaction, "ram:ApplicableHeaderTradeDelivery")
+        yield ET.Element(_T.ApplicableHeaderTradeDelivery, nsmap=XRECHNUNG_NSMAP)
         
         # Applicable header trade settlement
-        settlement = ET.SubElement(transaction, "ram:ApplicableHeaderTradeSettlement")
-        ET.SubElement(settlement, "ram:InvoiceCurrencyCode").text = invoice.currency
+        settlement = ET.Element(_T.ApplicableHeaderTradeSettlement, nsmap=XRECHNUNG_NSMAP)
+        ET.SubElement(settlement, _T.InvoiceCurrencyCode).text = invoice.currency
         
         # Add tax breakdown
         for rate, tax_info in invoice.get_tax_breakdown().items():
-            self._add_tax_breakdown(settlement, tax_info)
+            self._add_tax_breakdown(settlement, rate, tax_info)
         
         # Specified trade settlement header monetary summation
-        monetary_summation = ET.SubElement(settlement, "ram:SpecifiedTradeSettlementHeaderMonetarySummation")
-        ET.SubElement(monetary_summation, "ram:LineTotalAmount").text = str(invoice.total_net_amount)
-        ET.SubElement(monetary_summation, "ram:TaxBasisTotalAmount").text = str(invoice.total_net_amount)
-        ET.SubElement(monetary_summation, "ram:TaxTotalAmount").text = str(invoice.total_tax_amount)
-        ET.SubElement(monetary_summation, "ram:GrandTotalAmount").text = str(invoice.total_gross_amount)
-        ET.SubElement(monetary_summation, "ram:DuePayableAmount").text = str(invoice.total_gross_amount)
+        monetary_summation = ET.SubElement(settlement, _T.SpecifiedTradeSettlementHeaderMonetarySummation)
+        ET.SubElement(monetary_summation, _T.LineTotalAmount).text = str(invoice.total_net_amount)
+        ET.SubElement(monetary_summation, _T.TaxBasisTotalAmount).text = str(invoice.total_net_amount)
+        ET.SubElement(monetary_summation, _T.TaxTotalAmount).text = str(invoice.total_tax_amount)
+        ET.SubElement(monetary_summation, _T.GrandTotalAmount).text = str(invoice.total_gross_amount)
+        ET.SubElement(monetary_summation, _T.DuePayableAmount).text = str(invoice.total_gross_amount)
         
         # Payment terms
         if invoice.payment_terms:
-            payment_terms = ET.SubElement(settlement, "ram:SpecifiedTradePaymentTerms")
-            ET.SubElement(payment_terms, "ram:Description").text = invoice.payment_terms
+            payment_terms = ET.SubElement(settlement, _T.SpecifiedTradePaymentTerms)
+            ET.SubElement(payment_terms, _T.Description).text = invoice.payment_terms
             
             # Due date
-            due_date_elem = ET.SubElement(payment_terms, "ram:DueDateDateTime")
-            due_date_str = ET.SubElement(due_date_elem, "udt:DateTimeString")
+            due_date_elem = ET.SubElement(payment_terms, _T.DueDateDateTime)
+            due_date_str = ET.SubElement(due_date_elem, _T.DateTimeString)
             due_date_str.set("format", "102")
             due_date_str.text = invoice.due_date.strftime("%Y%m%d")
-        
-        # Convert to string
-        ET.indent(root, space="  ")
-        return ET.tostring(root, encoding="unicode", xml_declaration=True)
+        yield settlement
     
     def _add_party_info(self, parent: ET.Element, party: PartyInfo, party_type: str) -> None:
         """Add party information to XML."""
         # Party name
-        ET.SubElement(parent, "ram:Name").text = party.name
+        ET.SubElement(parent, _T.Name).text = party.name
         
         # Postal address
-        address = ET.SubElement(parent, "ram:PostalTradeAddress")
-        ET.SubElement(address, "ram:PostcodeCode").text = party.postal_code
-        ET.SubElement(address, "ram:LineOne").text = party.address_line1
+        address = ET.SubElement(parent, _T.PostalTradeAddress)
+        ET.SubElement(address, _T.PostcodeCode).text = party.postal_code
+        ET.SubElement(address, _T.LineOne).text = party.address_line1
         if party.address_line2:
-            ET.SubElement(address, "ram:LineTwo").text = party.address_line2
-        ET.SubElement(address, "ram:CityName").text = party.city
-        ET.SubElement(address, "ram:CountryID").text = party.country_code
+            ET.SubElement(address, _T.LineTwo).text = party.address_line2
+        ET.SubElement(address, _T.CityName).text = party.city
+        ET.SubElement(address, _T.CountryID).text = party.country_code
         
         # Tax registration
         if party.vat_id:
-            tax_reg = ET.SubElement(parent, "ram:SpecifiedTaxRegistration")
-            tax_id = ET.SubElement(tax_reg, "ram:ID")
+            tax_reg = ET.SubElement(parent, _T.SpecifiedTaxRegistration)
+            tax_id = ET.SubElement(tax_reg, _T.ID)
             tax_id.set("schemeID", "VA")
             tax_id.text = party.vat_id
         
         if party.tax_number:
-            tax_reg = ET.SubElement(parent, "ram:SpecifiedTaxRegistration")
-            tax_id = ET.SubElement(tax_reg, "ram:ID")
+            tax_reg = ET.SubElement(parent, _T.SpecifiedTaxRegistration)
+            tax_id = ET.SubElement(tax_reg, _T.ID)
             tax_id.set("schemeID", "FC")
             tax_id.text = party.tax_number
     
-    def _add_line_item(self, parent: ET.Element, item: InvoiceLineItem) -> None:
-        """Add line item to XML."""
-        line_item = ET.SubElement(parent, "ram:IncludedSupplyChainTradeLineItem")
+    @staticmethod
+    def _build_line_item_template() -> ET.Element:
+        """Build an empty line item subtree whose leaves are filled per item."""
+        line_item = ET.Element(_T.IncludedSupplyChainTradeLineItem, nsmap=XRECHNUNG_NSMAP)
         
         # Associated document line document
-        line_doc = ET.SubElement(line_item, "ram:AssociatedDocumentLineDocument")
-        ET.SubElement(line_doc, "ram:LineID").text = item.line_id
+        line_doc = ET.SubElement(line_item, _T.AssociatedDocumentLineDocument)
+        ET.SubElement(line_doc, _T.LineID)
         
         # Specified trade product
-        product = ET.SubElement(line_item, "ram:SpecifiedTradeProduct")
-        ET.SubElement(product, "ram:Name").text = item.description
+        product = ET.SubElement(line_item, _T.SpecifiedTradeProduct)
+        ET.SubElement(product, _T.Name)
         
-        # Specified line trade agreement
-        agreement = ET.SubElement(line_item, "ram:SpecifiedLineTradeAgreement")
+        # Specified line trade agreement with net price product trade price
+        agreement = ET.SubElement(line_item, _T.SpecifiedLineTradeAgreement)
+        price = ET.SubElement(agreement, _T.NetPriceProductTradePrice)
+        ET.SubElement(price, _T.ChargeAmount)
         
-        # Net price product trade price
-        price = ET.SubElement(agreement, "ram:NetPriceProductTradePrice")
-        ET.SubElement(price, "ram:ChargeAmount").text = str(item.unit_price)
+        # Specified line trade delivery with billed quantity
+        delivery = ET.SubElement(line_item, _T.SpecifiedLineTradeDelivery)
+        ET.SubElement(delivery, _T.BilledQuantity)
         
-        # Specified line trade delivery
-        delivery = ET.SubElement(line_item, "ram:SpecifiedLineTradeDelivery")
+        # Specified line trade settlement with applicable trade tax
+        settlement = ET.SubElement(line_item, _T.SpecifiedLineTradeSettlement)
+        tax = ET.SubElement(settlement, _T.ApplicableTradeTax)
+        ET.SubElement(tax, _T.TypeCode)
+        ET.SubElement(tax, _T.CategoryCode)
+        ET.SubElement(tax, _T.RateApplicablePercent)
         
-        # Billed quantity
-        quantity = ET.SubElement(delivery, "ram:BilledQuantity")
+        # Specified trade settlement line monetary summation
+        monetary = ET.SubElement(settlement, _T.SpecifiedTradeSettlementLineMonetarySummation)
+        ET.SubElement(monetary, _T.LineTotalAmount)
+        return line_item
+    
+    def _build_line_item(self, item: InvoiceLineItem) -> ET.Element:
+        """Build the XML subtree for one line item."""
+        # Copying the prebuilt subtree is a single C-level call; only the
+        # leaf values are set from Python
+        line_item = copy.deepcopy(self._line_item_template)
+        (line_id, name, charge_amount, quantity,
+         tax_type, tax_category, tax_rate, line_total) = line_item.iter(*_LINE_ITEM_LEAVES)
+        
+        line_id.text = item.line_id
+        name.text = item.description
+        charge_amount.text = str(item.unit_price)
         quantity.set("unitCode", item.unit)
         quantity.text = str(item.quantity)
-        
-        # Specified line trade settlement
-        settlement = ET.SubElement(line_item, "ram:SpecifiedLineTradeSettlement")
-        
-        # Applicable trade tax
-        tax = ET.SubElement(settlement, "ram:ApplicableTradeTax")
-        ET.SubElement(tax, "ram:TypeCode").text = item.tax_info.tax_scheme
-        ET.SubElement(tax, "ram:CategoryCode").text = item.tax_info.tax_category
-        ET.SubElement(tax, "ram:RateApplicablePercent").text = str(item.tax_info.tax_rate)
-        
-        # Specified trade settlement line monetary summation
-        monetary = ET.SubElement(settlement, "ram:SpecifiedTradeSettlementLineMonetarySummation")
-        ET.SubElement(monetary, "ram:LineTotalAmount").text = str(item.net_amount)
+        tax_type.text = item.tax_info.tax_scheme
+        tax_category.text = item.tax_info.tax_category
+        tax_rate.text = item.tax_info.rate_key
+        line_total.text = str(item.net_amount)
+        return line_item
     
-    def _add_tax_breakdown(self, parent: ET.Element, tax_info: Dict[str, Any]) -> None:
-        """Add tax breakdown to XML."""
-        tax = ET.SubElement(parent, "ram:ApplicableTradeTax")
-        ET.SubElement(tax, "ram:CalculatedAmount").text = str(tax_info["tax_amount"])
-        ET.SubElement(tax, "ram:TypeCode").text = "VAT"
-        ET.SubElement(tax, "ram:CategoryCode").text = tax_info["category"]
-        ET.SubElement(tax, "ram:BasisAmount").text = str(tax_info["net_amount"])
-        ET.SubElement(tax, "ram:RateApplicablePercent").text = str(tax_info["rate"])
+    def _add_tax_breakdown(self, parent: ET.Element, rate: str, tax_info: Dict[str, Any]) -> None:
+        """Add tax breakdown to XML; rate is the breakdown key, already str(rate)."""
+        tax = ET.SubElement(parent, _T.ApplicableTradeTax)
+        ET.SubElement(tax, _T.CalculatedAmount).text = str(tax_info["tax_amount"])
+        ET.SubElement(tax, _T.TypeCode).text = "VAT"
+        ET.SubElement(tax, _T.CategoryCode).text = tax_info["category"]
+        ET.SubElement(tax, _T.BasisAmount).text = str(tax_info["net_amount"])
+        ET.SubElement(tax, _T.RateApplicablePercent).text = rate
+
+
+# Per-process generator for EInvoiceManager.save_batch workers
+_batch_generator: Optional[XRechnungGenerator] = None
+
+
+def _init_batch_worker() -> None:
+    """Create the XRechnung generator once per worker process."""
+    global _batch_generator
+    _batch_generator = XRechnungGenerator()
+
+
+def _party_data(party: PartyInfo) -> Dict[str, Any]:
+    """Party fields as a plain dict."""
+    return {name: getattr(party, name) for name in PartyInfo.__slots__}
+
+
+def _batch_invoice_data(invoice: EInvoice) -> Dict[str, Any]:
+    """
+    Plain-data form of an invoice for save_batch workers.
+    
+    Holds only builtins, dates and Decimals, so workers never receive the
+    invoice's shared PartyInfo/TaxInfo objects. Unlike to_dict it keeps every
+    field the XML needs, at full Decimal precision.
+    """
+    return {
+        "invoice_number": invoice.invoice_number,
+        "invoice_date": invoice.invoice_date,
+        "due_date": invoice.due_date,
+        "seller": _party_data(invoice.seller),
+        "buyer": _party_data(invoice.buyer),
+        "invoice_type": invoice.invoice_type,
+        "currency": invoice.currency,
+        "payment_terms": invoice.payment_terms,
+        "reference_number": invoice.reference_number,
+        "line_items": [
+            {
+                "line_id": item.line_id,
+                "description": item.description,
+                "quantity": item.quantity,
+                "unit": item.unit,
+                "unit_price": item.unit_price,
+                "tax": (item.tax_info.tax_rate, item.tax_info.tax_category, item.tax_info.tax_scheme),
+                "period_start": item.period_start,
+                "period_end": item.period_end,
+                "metering_point_id": item.metering_point_id
+            }
+            for item in invoice.line_items
+        ],
+        "totals": (invoice.total_net_amount, invoice.total_tax_amount, invoice.total_gross_amount)
+    }
+
+
+def _invoice_from_batch_data(data: Dict[str, Any]) -> EInvoice:
+    """Rebuild an invoice from _batch_invoice_data output."""
+    invoice = EInvoice(
+        invoice_number=data["invoice_number"],
+        invoice_date=data["invoice_date"],
+        due_date=data["due_date"],
+        seller=PartyInfo(**data["seller"]),
+        buyer=PartyInfo(**data["buyer"]),
+        invoice_type=data["invoice_type"],
+        currency=data["currency"],
+        payment_terms=data["payment_terms"],
+        reference_number=data["reference_number"]
+    )
+    
+    tax_infos: Dict[tuple, TaxInfo] = {}
+    line_items = []
+    for item in data["line_items"]:
+        item = dict(item)
+        tax = item.pop("tax")
+        tax_info = tax_infos.get(tax)
+        if tax_info is None:
+            tax_info = tax_infos[tax] = TaxInfo(*tax)
+        line_items.append(InvoiceLineItem(tax_info=tax_info, **item))
+    invoice.add_line_items(line_items)
+    
+    # Totals may have been set explicitly on the original invoice
+    invoice.total_net_amount, invoice.total_tax_amount, invoice.total_gross_amount = data["totals"]
+    return invoice
+
+
+def _write_batch_invoice(data: Dict[str, Any], filepath: str) -> None:
+    """Render one invoice to XRechnung XML inside a worker process."""
+    _batch_generator.write_xml(_invoice_from_batch_data(data), filepath)
 
 
 class EInvoiceManager:
@@ -488,7 +920,8 @@ class EInvoiceManager:
     def __init__(
         self,
         cooperative_info: PartyInfo,
-        output_directory: str = "/tmp/einvoices"
+        output_directory: str = "/tmp/einvoices",
+        schema_path: Optional[str] = None
     ):
         """
         Initialize E-Invoice manager.
@@ -496,13 +929,36 @@ class EInvoiceManager:
         Args:
             cooperative_info: CoMaKo cooperative information
             output_directory: Directory for generated invoices
+            schema_path: XRechnung CII XSD used by validate_xml
         """
         self.cooperative_info = cooperative_info
         self.output_directory = Path(output_directory)
-        self.output_directory.mkdir(parents=True, exist_ok=True)
+        self.schema_path = schema_path
         
         self.xrechnung_generator = XRechnungGenerator()
-        self.generated_invoices: List[EInvoice] = []
+        
+        # Running statistics; invoices themselves are not retained, callers
+        # keep the ones they need from the create_* return values
+        self._statistics = _InvoiceStatistics()
+        
+        # Fixed billing inputs shared by every invoice; each invoice gets its
+        # own TaxInfo since its rate can be changed
+        self._standard_vat_rate = Decimal('19.0')  # 19% VAT for energy
+        self._basic_fee = Decimal('5.90')  # Monthly basic fee
+        
+        # Invoice number suffixes count up from one random 32-bit start per
+        # manager, so numbers stay unique without an RNG call per invoice
+        self._number_seq = itertools.count(int.from_bytes(os.urandom(4), "big"))
+        self._number_date: Optional[date] = None
+        self._number_date_str = ""
+    
+    def _next_invoice_number(self, kind: str) -> str:
+        """Generate an invoice number of the form KIND-YYYYMMDD-XXXXXXXX."""
+        today = date.today()
+        if today != self._number_date:
+            self._number_date = today
+            self._number_date_str = today.strftime('%Y%m%d')
+        return f"{kind}-{self._number_date_str}-{next(self._number_seq) & 0xFFFFFFFF:08X}"
     
     def create_customer_bill(
         self,
@@ -530,13 +986,14 @@ class EInvoiceManager:
             Generated invoice
         """
         if not invoice_number:
-            invoice_number = f"BILL-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+            invoice_number = self._next_invoice_number("BILL")
         
+        today = date.today()
         # Create invoice
         invoice = EInvoice(
             invoice_number=invoice_number,
-            invoice_date=date.today(),
-            due_date=date.today().replace(day=min(date.today().day + 14, 28)),  # 14 days payment term
+            invoice_date=today,
+            due_date=today + timedelta(days=14),  # 14 days payment term
             seller=self.cooperative_info,
             buyer=customer_info,
             invoice_type="CUSTOMER_BILL",
@@ -544,7 +1001,7 @@ class EInvoiceManager:
         )
         
         # Add consumption line item
-        tax_info = TaxInfo(Decimal('19.0'))  # 19% VAT for energy
+        tax_info = TaxInfo(self._standard_vat_rate)
         
         line_item = InvoiceLineItem(
             line_id="1",
@@ -558,24 +1015,21 @@ class EInvoiceManager:
             metering_point_id=metering_point_id
         )
         
-        invoice.add_line_item(line_item)
-        
         # Add basic fee if applicable
-        basic_fee = Decimal('5.90')  # Monthly basic fee
         basic_fee_item = InvoiceLineItem(
             line_id="2",
             description="Grundgebühr Stromlieferung",
-            quantity=Decimal('1'),
+            quantity=_ONE,
             unit="MON",
-            unit_price=basic_fee,
+            unit_price=self._basic_fee,
             tax_info=tax_info,
             period_start=billing_period_start,
             period_end=billing_period_end
         )
         
-        invoice.add_line_item(basic_fee_item)
+        invoice.add_line_items([line_item, basic_fee_item])
         
-        self.generated_invoices.append(invoice)
+        self._statistics.add_invoice(invoice)
         logger.info(f"Created customer bill {invoice_number} for {customer_info.name}")
         
         return invoice
@@ -606,13 +1060,14 @@ class EInvoiceManager:
             Generated credit invoice
         """
         if not invoice_number:
-            invoice_number = f"CREDIT-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+            invoice_number = self._next_invoice_number("CREDIT")
         
+        today = date.today()
         # Create credit invoice (producer as seller, cooperative as buyer)
         invoice = EInvoice(
             invoice_number=invoice_number,
-            invoice_date=date.today(),
-            due_date=date.today().replace(day=min(date.today().day + 30, 28)),  # 30 days payment term
+            invoice_date=today,
+            due_date=today + timedelta(days=30),  # 30 days payment term
             seller=producer_info,
             buyer=self.cooperative_info,
             invoice_type="PRODUCER_CREDIT",
@@ -620,7 +1075,7 @@ class EInvoiceManager:
         )
         
         # Add production line item
-        tax_info = TaxInfo(Decimal('19.0'))  # 19% VAT for energy
+        tax_info = TaxInfo(self._standard_vat_rate)
         
         line_item = InvoiceLineItem(
             line_id="1",
@@ -636,7 +1091,7 @@ class EInvoiceManager:
         
         invoice.add_line_item(line_item)
         
-        self.generated_invoices.append(invoice)
+        self._statistics.add_invoice(invoice)
         logger.info(f"Created producer credit {invoice_number} for {producer_info.name}")
         
         return invoice
@@ -667,7 +1122,7 @@ class EInvoiceManager:
             Generated settlement invoice
         """
         if not invoice_number:
-            invoice_number = f"SETTLE-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+            invoice_number = self._next_invoice_number("SETTLE")
         
         # Determine seller/buyer based on settlement amount
         if settlement_amount >= 0:
@@ -682,11 +1137,12 @@ class EInvoiceManager:
             description = f"Ausgleichsenergie-Gutschrift {settlement_type}"
             settlement_amount = abs(settlement_amount)
         
+        today = date.today()
         # Create settlement invoice
         invoice = EInvoice(
             invoice_number=invoice_number,
-            invoice_date=date.today(),
-            due_date=date.today().replace(day=min(date.today().day + 14, 28)),
+            invoice_date=today,
+            due_date=today + timedelta(days=14),
             seller=seller,
             buyer=buyer,
             invoice_type="SETTLEMENT",
@@ -695,12 +1151,12 @@ class EInvoiceManager:
         )
         
         # Add settlement line item
-        tax_info = TaxInfo(Decimal('19.0'))
+        tax_info = TaxInfo(self._standard_vat_rate)
         
         line_item = InvoiceLineItem(
             line_id="1",
             description=description,
-            quantity=Decimal('1'),
+            quantity=_ONE,
             unit="EA",
             unit_price=settlement_amount,
             tax_info=tax_info,
@@ -710,7 +1166,7 @@ class EInvoiceManager:
         
         invoice.add_line_item(line_item)
         
-        self.generated_invoices.append(invoice)
+        self._statistics.add_invoice(invoice)
         logger.info(f"Created settlement invoice {invoice_number}")
         
         return invoice
@@ -719,6 +1175,57 @@ class EInvoiceManager:
         """Generate XRechnung XML for invoice."""
         return self.xrechnung_generator.generate_xml(invoice)
     
+    def validate_xml(self, xml: Union[str, bytes]) -> bool:
+        """
+        Validate an XRechnung document against the configured XSD.
+        
+        The schema is compiled on first use and shared by all managers
+        using the same path.
+        
+        Args:
+            xml: Document as returned by generate_xrechnung_xml or
+                XRechnungGenerator.generate_xml_bytes
+            
+        Returns:
+            True if the document is schema-valid; violations are logged
+        """
+        if not self.schema_path:
+            raise EInvoiceError("No XRechnung schema configured")
+        schema = _load_schema(self.schema_path)
+        
+        if isinstance(xml, str):
+            xml = xml.encode("utf-8")
+        try:
+            document = ET.fromstring(xml, _VALIDATION_PARSER)
+        except ET.XMLSyntaxError as e:
+            logger.warning(f"XRechnung document is not well-formed: {e}")
+            return False
+        
+        if schema.validate(document):
+            return True
+        for error in schema.error_log:
+            logger.warning(f"XRechnung schema violation (line {error.line}): {error.message}")
+        return False
+    
+    @property
+    def output_directory(self) -> Path:
+        """Directory for generated invoices, created on the first save."""
+        return self._output_directory
+    
+    @output_directory.setter
+    def output_directory(self, value: Union[str, Path]) -> None:
+        self._output_directory = Path(value)
+        # Plain string form for building file paths without Path objects
+        self._output_directory_str = os.fspath(self._output_directory)
+        self._output_directory_ready = False
+    
+    def _output_path(self, filename: str) -> str:
+        """Path of a file in the output directory, creating it once if needed."""
+        if not self._output_directory_ready:
+            self._output_directory.mkdir(parents=True, exist_ok=True)
+            self._output_directory_ready = True
+        return os.path.join(self._output_directory_str, filename)
+    
     def save_invoice(self, invoice: EInvoice, format: str = "xml") -> str:
         """
         Save invoice to file.
@@ -730,43 +1237,75 @@ class EInvoiceManager:
         Returns:
             Path to saved file
         """
-        filename = f"{invoice.invoice_number}.{format}"
-        filepath = self.output_directory / filename
+        filepath = self._output_path(f"{invoice.invoice_number}.{format}")
         
         if format == "xml":
-            xml_content = self.generate_xrechnung_xml(invoice)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
+            self.xrechnung_generator.write_xml(invoice, filepath)
         elif format == "json":
-            import json
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(invoice.to_dict(), f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                # orjson encodes straight to UTF-8 bytes, with the same layout
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(invoice.to_dict(), option=orjson.OPT_INDENT_2))
+            else:
+                import json
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(invoice.to_dict(), f, indent=2, ensure_ascii=False)
         else:
             raise EInvoiceError(f"Unsupported format: {format}")
         
         logger.info(f"Saved invoice {invoice.invoice_number} to {filepath}")
-        return str(filepath)
+        return filepath
     
-    def get_invoice_statistics(self) -> Dict[str, Any]:
-        """Get statistics about generated invoices."""
-        total_invoices = len(self.generated_invoices)
+    def save_batch(self, invoices: List[EInvoice], workers: Optional[int] = None) -> List[str]:
+        """
+        Save many invoices as XRechnung XML using a pool of worker processes.
         
-        by_type = {}
-        total_amounts = {}
+        XML rendering is CPU-bound and holds the GIL, so a batch is spread
+        across processes instead of threads. Workers receive each invoice as
+        plain data and rebuild it before rendering.
         
-        for invoice in self.generated_invoices:
-            invoice_type = invoice.invoice_type
-            by_type[invoice_type] = by_type.get(invoice_type, 0) + 1
+        Args:
+            invoices: Invoices to save
+            workers: Number of worker processes (default: CPU count);
+                1 renders serially in this process
             
-            if invoice_type not in total_amounts:
-                total_amounts[invoice_type] = Decimal('0.00')
-            total_amounts[invoice_type] += invoice.total_gross_amount
+        Returns:
+            Paths to the saved files, in input order
+        """
+        filepaths = [self._output_path(f"{invoice.invoice_number}.xml") for invoice in invoices]
+        workers = workers or os.cpu_count() or 1
+        
+        if workers == 1 or len(invoices) < 2:
+            for invoice, filepath in zip(invoices, filepaths):
+                self.xrechnung_generator.write_xml(invoice, filepath)
+        else:
+            # Imported here; multiprocessing is only needed for parallel batches
+            from concurrent.futures import ProcessPoolExecutor
+            payloads = [_batch_invoice_data(invoice) for invoice in invoices]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as pool:
+                # Hand out invoices in chunks to amortize pickling round-trips
+                chunksize = max(1, len(invoices) // (workers * 4))
+                for _ in pool.map(_write_batch_invoice, payloads, filepaths, chunksize=chunksize):
+                    pass
+        
+        logger.info(f"Saved batch of {len(invoices)} invoices to {self.output_directory}")
+        return filepaths
+    
+    def get_invoice_statistics(self) -> Dict[str, Any]:
+        """
+        Get statistics about generated invoices.
         
+        Amounts follow changes made through add_line_item(s), line_items
+        assignment and the total setters. Items appended to, removed from or
+        replaced in an invoice's line_items list directly are counted once its
+        totals are next read.
+        """
+        statistics = self._statistics
         return {
-            "total_invoices": total_invoices,
-            "by_type": by_type,
-            "total_amounts": {k: float(v) for k, v in total_amounts.items()},
-            "output_directory": str(self.output_directory)
+            "total_invoices": statistics.count,
+            "by_type": dict(statistics.count_by_type),
+            "total_amounts": {k: float(v) for k, v in statistics.amount_by_type.items()},
+            "output_directory": self._output_directory_str
         }
 
 
@@ -790,7 +1329,7 @@ def get_comako_party_info() -> PartyInfo:
 def setup_einvoice_manager() -> EInvoiceManager:
     """Set up E-Invoice manager with CoMaKo configuration."""
     cooperative_info = get_comako_party_info()
-    return EInvoiceManager(cooperative_info)
+    return EInvoiceManager(cooperative_info, schema_path=os.getenv("XRECHNUNG_XSD_PATH"))
 
 
 # Example usage and testing
@@ -5,13 +5,124 @@ This module provides functionality to convert parsed EDI data structures
 into standardized JSON format for internal processing.
 """
 
+from array import array
+import functools
 import json
-from typing import Dict, Any, List, Optional
+import sys
+import time
+from typing import Dict, Any, Iterable, List, Literal, Optional, Union
 from datetime import datetime, timezone
 import logging
+import math
+
+from src.services.edi_parser import parse_decimal
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON encoder, stdlib json is used without it
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# orjson options close to json.dumps(default=str): non-str keys are stringified
+# and datetimes/dataclasses go through default=str like stdlib json
+_ORJSON_COMPAT = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+) if orjson is not None else 0
+_ORJSON_PRETTY = _ORJSON_COMPAT | orjson.OPT_INDENT_2 if orjson is not None else 0
+
+# Segments merged into the header and metadata sections; everything else mapped goes to body
+_HEADER_SEGS = frozenset(('UNB', 'UNH', 'BGM'))
+_TRAILER_SEGS = frozenset(('UNT', 'UNZ'))
+
+# Code elements (qualifiers, units, message types) up to this length are interned,
+# so bulk conversions share one string object per distinct code
+_CODE_MAX_LENGTH = 6
+
+
+def _count(value: Any) -> Optional[int]:
+    """Parse a trailer count element, mapping empty values to None."""
+    return int(value) if value else None
+
+
+def _code(value: Any) -> Any:
+    """Intern a short code element; other values are returned unchanged."""
+    if type(value) is str and len(value) <= _CODE_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+_QUALIFIER = ('qualifier', _code)
+
+# Segment name -> (wrapper key, positional field names, minimum element count,
+# coercions). Lists shorter than the minimum, and non-list data, are passed
+# through under the wrapper key unchanged. Numeric coercions map empty values
+# to None; measured values go through the parser's parse_decimal, so decimal
+# commas are accepted and malformed or non-finite values become None.
+_SEGMENT_SCHEMA = {
+    'UNB': ('interchange_header', ('syntax_identifier', 'sender', 'recipient', 'date_time', 'control_reference'), 4, ()),
+    'UNH': ('message_header', ('reference_number', 'message_type', 'version', 'release'), 2,
+            (('message_type', _code), ('version', _code), ('release', _code))),
+    'BGM': ('document_info', ('document_name', 'document_number', 'message_function'), 2,
+            (('document_name', _code), ('message_function', _code))),
+    'DTM': ('date_time', ('qualifier', 'date', 'format'), 2, (_QUALIFIER, ('format', _code))),
+    'NAD': ('party_info', ('qualifier', 'identification', 'name', 'address'), 2, (_QUALIFIER,)),
+    'LOC': ('location', ('qualifier', 'identification', 'description'), 2, (_QUALIFIER,)),
+    'QTY': ('quantity', ('qualifier', 'value', 'unit'), 2,
+            (_QUALIFIER, ('value', parse_decimal), ('unit', _code))),
+    'MEA': ('measurement', ('qualifier', 'dimension', 'value', 'unit'), 3,
+            (_QUALIFIER, ('dimension', _code), ('value', parse_decimal), ('unit', _code))),
+    'UNT': ('message_trailer', ('segment_count', 'reference_number'), 2, (('segment_count', _count),)),
+    'UNZ': ('interchange_trailer', ('group_count', 'control_reference'), 2, (('group_count', _count),)),
+}
+
+# Appended to segment element lists so every schema field has a value to zip with
+_PADDING = [None] * max(len(fields) for _, fields, _, _ in _SEGMENT_SCHEMA.values())
+
+# Message type -> (section key, section fields with their empty-value factory,
+# segment -> (section field, append)). Converted segments of the listed types are
+# collected into the section during the conversion pass; non-append fields are
+# overwritten.
+_MESSAGE_SECTIONS = {
+    'UTILMD': (
+        'utilities_data',
+        (('metering_points', list), ('consumption_data', list), ('meter_readings', list)),
+        {'LOC': ('metering_points', True), 'QTY': ('consumption_data', True), 'MEA': ('meter_readings', True)},
+    ),
+    'MSCONS': (
+        'consumption_report',
+        (('reporting_period', dict), ('meter_readings', list), ('consumption_totals', list)),
+        {'DTM': ('reporting_period', False), 'QTY': ('consumption_totals', True), 'MEA': ('meter_readings', True)},
+    ),
+}
+
+
+@functools.lru_cache(maxsize=2)
+def _now_iso(second: int) -> str:
+    """ISO 8601 UTC timestamp for a Unix second, formatted once per second."""
+    return datetime.fromtimestamp(second, timezone.utc).isoformat()
+
+
+def _convert_segment(segment_name: str, segment_data: Any) -> Dict[str, Any]:
+    """Convert one segment's positional elements into named fields per _SEGMENT_SCHEMA."""
+    key, fields, min_length, coercions = _SEGMENT_SCHEMA[segment_name]
+    if isinstance(segment_data, list) and len(segment_data) >= min_length:
+        payload = dict(zip(fields, segment_data + _PADDING))
+        for field, coerce in coercions:
+            payload[field] = coerce(payload[field])
+        return {key: payload}
+    return {key: segment_data}
+
+
+def _schema_converter(segment_name: str, description: str):
+    """Build the _convert_*_segment method for one entry of _SEGMENT_SCHEMA."""
+    def convert(self, segment_data: Any) -> Dict[str, Any]:
+        return _convert_segment(segment_name, segment_data)
+
+    convert.__name__ = f"_convert_{segment_name.lower()}_segment"
+    convert.__doc__ = f"Convert {segment_name} ({description}) segment."
+    return convert
+
 
 class EDIConverter:
     """
@@ -21,7 +132,17 @@ class EDIConverter:
     that can be easily processed by downstream systems.
     """
     
-    def __init__(self):
+    def __init__(self, detail_level: Literal["full", "minimal"] = "full"):
+        """
+        Args:
+            detail_level: "full" keeps a per-segment copy of every converted
+                          segment in "segments"; "minimal" only lists unmapped
+                          segments there, since mapped ones are already merged
+                          into header, body and metadata
+        """
+        if detail_level not in ("full", "minimal"):
+            raise ValueError(f"Unknown detail level: {detail_level}")
+        self.detail_level = detail_level
         self.segment_mappings = {
             'UNB': self._convert_unb_segment,
             'UNH': self._convert_unh_segment,
@@ -35,12 +156,22 @@ class EDIConverter:
             'UNZ': self._convert_unz_segment,
         }
     
-    def convert_to_json(self, edi_data: Dict[str, Any]) -> Dict[str, Any]:
+    def convert_to_json(
+        self,
+        edi_data: Dict[str, Any],
+        timestamp: Optional[str] = None,
+        message_type_hint: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Convert parsed EDI data to JSON format.
         
         Args:
             edi_data: Dictionary containing parsed EDI segments
+            timestamp: Conversion timestamp to record; defaults to the current
+                       UTC time at one-second resolution
+            message_type_hint: "UTILMD" or "MSCONS" to also build that message's
+                               utilities_data/consumption_report section in the
+                               same pass, if the message is of that type
             
         Returns:
             Dictionary with standardized JSON structure
@@ -48,41 +179,72 @@ class EDIConverter:
         try:
             json_output = {
                 "message_type": self._determine_message_type(edi_data),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": timestamp if timestamp is not None else _now_iso(int(time.time())),
                 "header": {},
                 "body": {},
-                "segments": [],
+                "segments": None,
                 "metadata": {
                     "conversion_version": "1.0",
                     "source_format": "EDIFACT"
                 }
             }
             
+            # Message-specific section filled during the segment loop
+            section = routes = None
+            if message_type_hint is not None and json_output["message_type"] == message_type_hint:
+                section_spec = _MESSAGE_SECTIONS.get(message_type_hint)
+                if section_spec is not None:
+                    section_key, section_fields, routes = section_spec
+                    section = json_output[section_key] = {
+                        field: factory() for field, factory in section_fields
+                    }
+            
             # Process each segment
-            for segment_name, segment_data in edi_data.items():
-                if segment_name in self.segment_mappings:
-                    converted_segment = self.segment_mappings[segment_name](segment_data)
+            get_converter = self.segment_mappings.get
+            header = json_output["header"]
+            body = json_output["body"]
+            metadata = json_output["metadata"]
+            full = self.detail_level == "full"
+            # In full detail every input segment yields exactly one entry, mapped or not
+            segments = json_output["segments"] = [None] * len(edi_data) if full else []
+            for i, (segment_name, segment_data) in enumerate(edi_data.items()):
+                convert = get_converter(segment_name)
+                if convert is not None:
+                    converted_segment = convert(segment_data)
                     
                     # Categorize segments
-                    if segment_name in ['UNB', 'UNH', 'BGM']:
-                        json_output["header"].update(converted_segment)
-                    elif segment_name in ['UNT', 'UNZ']:
-                        json_output["metadata"].update(converted_segment)
+                    if segment_name in _HEADER_SEGS:
+                        header.update(converted_segment)
+                    elif segment_name in _TRAILER_SEGS:
+                        metadata.update(converted_segment)
                     else:
-                        json_output["body"].update(converted_segment)
+                        body.update(converted_segment)
+                    
+                    if routes is not None and segment_name in routes:
+                        field, append = routes[segment_name]
+                        value = converted_segment[_SEGMENT_SCHEMA[segment_name][0]]
+                        if append:
+                            section[field].append(value)
+                        else:
+                            section[field] = value
                     
                     # Keep detailed segment info
-                    json_output["segments"].append({
-                        "segment_type": segment_name,
-                        "data": converted_segment
-                    })
+                    if full:
+                        segments[i] = {
+                            "segment_type": sys.intern(segment_name),
+                            "data": converted_segment
+                        }
                 else:
                     logger.warning(f"Unknown segment type: {segment_name}")
-                    json_output["segments"].append({
+                    unmapped = {
                         "segment_type": segment_name,
                         "data": segment_data,
                         "status": "unmapped"
-                    })
+                    }
+                    if full:
+                        segments[i] = unmapped
+                    else:
+                        segments.append(unmapped)
             
             return json_output
             
@@ -90,152 +252,65 @@ class EDIConverter:
             logger.error(f"Error converting EDI to JSON: {e}")
             raise ValueError(f"EDI conversion failed: {e}")
     
+    @classmethod
+    def convert_many(cls, edi_datas: Iterable[Dict[str, Any]], timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Convert a batch of parsed EDI messages with one converter.
+        
+        Args:
+            edi_datas: Parsed EDI messages
+            timestamp: Conversion timestamp shared by the whole batch; defaults
+                       to the current UTC time
+            
+        Returns:
+            JSON structures in input order
+        """
+        if timestamp is None:
+            timestamp = _now_iso(int(time.time()))
+        convert = cls().convert_to_json
+        return [convert(edi_data, timestamp) for edi_data in edi_datas]
+    
     def _determine_message_type(self, edi_data: Dict[str, Any]) -> str:
         """Determine the EDI message type from the data."""
-        if 'UNH' in edi_data:
+        try:
             unh_data = edi_data['UNH']
-            if isinstance(unh_data, dict) and 'message_type' in unh_data:
-                return unh_data['message_type']
-            elif isinstance(unh_data, list) and len(unh_data) > 1:
+            # Parsed UNH segments are lists with the message type second
+            if isinstance(unh_data, list):
                 return unh_data[1]
+            if isinstance(unh_data, dict):
+                return unh_data['message_type']
+        except (KeyError, IndexError):
+            pass
         
         # Default fallback
         return "UNKNOWN"
     
-    def _convert_unb_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert UNB (Interchange Header) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 4:
-            return {
-                "interchange_header": {
-                    "syntax_identifier": segment_data[0] if len(segment_data) > 0 else None,
-                    "sender": segment_data[1] if len(segment_data) > 1 else None,
-                    "recipient": segment_data[2] if len(segment_data) > 2 else None,
-                    "date_time": segment_data[3] if len(segment_data) > 3 else None,
-                    "control_reference": segment_data[4] if len(segment_data) > 4 else None
-                }
-            }
-        return {"interchange_header": segment_data}
-    
-    def _convert_unh_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert UNH (Message Header) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "message_header": {
-                    "reference_number": segment_data[0] if len(segment_data) > 0 else None,
-                    "message_type": segment_data[1] if len(segment_data) > 1 else None,
-                    "version": segment_data[2] if len(segment_data) > 2 else None,
-                    "release": segment_data[3] if len(segment_data) > 3 else None
-                }
-            }
-        return {"message_header": segment_data}
-    
-    def _convert_bgm_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert BGM (Beginning of Message) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "document_info": {
-                    "document_name": segment_data[0] if len(segment_data) > 0 else None,
-                    "document_number": segment_data[1] if len(segment_data) > 1 else None,
-                    "message_function": segment_data[2] if len(segment_data) > 2 else None
-                }
-            }
-        return {"document_info": segment_data}
-    
-    def _convert_dtm_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert DTM (Date/Time) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "date_time": {
-                    "qualifier": segment_data[0] if len(segment_data) > 0 else None,
-                    "date": segment_data[1] if len(segment_data) > 1 else None,
-                    "format": segment_data[2] if len(segment_data) > 2 else None
-                }
-            }
-        return {"date_time": segment_data}
-    
-    def _convert_nad_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert NAD (Name and Address) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "party_info": {
-                    "qualifier": segment_data[0] if len(segment_data) > 0 else None,
-                    "identification": segment_data[1] if len(segment_data) > 1 else None,
-                    "name": segment_data[2] if len(segment_data) > 2 else None,
-                    "address": segment_data[3] if len(segment_data) > 3 else None
-                }
-            }
-        return {"party_info": segment_data}
-    
-    def _convert_loc_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert LOC (Location) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "location": {
-                    "qualifier": segment_data[0] if len(segment_data) > 0 else None,
-                    "identification": segment_data[1] if len(segment_data) > 1 else None,
-                    "description": segment_data[2] if len(segment_data) > 2 else None
-                }
-            }
-        return {"location": segment_data}
-    
-    def _convert_qty_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert QTY (Quantity) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "quantity": {
-                    "qualifier": segment_data[0] if len(segment_data) > 0 else None,
-                    "value": float(segment_data[1]) if len(segment_data) > 1 and segment_data[1] else None,
-                    "unit": segment_data[2] if len(segment_data) > 2 else None
-                }
-            }
-        return {"quantity": segment_data}
-    
-    def _convert_mea_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert MEA (Measurement) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 3:
-            return {
-                "measurement": {
-                    "qualifier": segment_data[0] if len(segment_data) > 0 else None,
-                    "dimension": segment_data[1] if len(segment_data) > 1 else None,
-                    "value": float(segment_data[2]) if len(segment_data) > 2 and segment_data[2] else None,
-                    "unit": segment_data[3] if len(segment_data) > 3 else None
-                }
-            }
-        return {"measurement": segment_data}
-    
-    def _convert_unt_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert UNT (Message Trailer) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "message_trailer": {
-                    "segment_count": int(segment_data[0]) if len(segment_data) > 0 and segment_data[0] else None,
-                    "reference_number": segment_data[1] if len(segment_data) > 1 else None
-                }
-            }
-        return {"message_trailer": segment_data}
-    
-    def _convert_unz_segment(self, segment_data: Any) -> Dict[str, Any]:
-        """Convert UNZ (Interchange Trailer) segment."""
-        if isinstance(segment_data, list) and len(segment_data) >= 2:
-            return {
-                "interchange_trailer": {
-                    "group_count": int(segment_data[0]) if len(segment_data) > 0 and segment_data[0] else None,
-                    "control_reference": segment_data[1] if len(segment_data) > 1 else None
-                }
-            }
-        return {"interchange_trailer": segment_data}
+    _convert_unb_segment = _schema_converter('UNB', 'Interchange Header')
+    _convert_unh_segment = _schema_converter('UNH', 'Message Header')
+    _convert_bgm_segment = _schema_converter('BGM', 'Beginning of Message')
+    _convert_dtm_segment = _schema_converter('DTM', 'Date/Time')
+    _convert_nad_segment = _schema_converter('NAD', 'Name and Address')
+    _convert_loc_segment = _schema_converter('LOC', 'Location')
+    _convert_qty_segment = _schema_converter('QTY', 'Quantity')
+    _convert_mea_segment = _schema_converter('MEA', 'Measurement')
+    _convert_unt_segment = _schema_converter('UNT', 'Message Trailer')
+    _convert_unz_segment = _schema_converter('UNZ', 'Interchange Trailer')
 
 
-def convert_edi_to_json(edi_data: Dict[str, Any]) -> Dict[str, Any]:
+def convert_edi_to_json(
+    edi_data: Union[Dict[str, Any], List[Dict[str, Any]]]
+) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Convenience function to convert EDI data to JSON.
     
     Args:
-        edi_data: Parsed EDI data structure
+        edi_data: Parsed EDI data structure, or a list of them
         
     Returns:
-        JSON representation of the EDI data
+        JSON representation of the EDI data; a list of them for list input
     """
+    if isinstance(edi_data, list):
+        return EDIConverter.convert_many(edi_data)
     converter = EDIConverter()
     return converter.convert_to_json(edi_data)
 
@@ -251,29 +326,7 @@ def convert_utilmd_to_json(edi_data: Dict[str, Any]) -> Dict[str, Any]:
         JSON structure optimized for utilities data processing
     """
     converter = EDIConverter()
-    json_data = converter.convert_to_json(edi_data)
-    
-    # Add UTILMD-specific processing
-    if json_data.get("message_type") == "UTILMD":
-        json_data["utilities_data"] = {
-            "metering_points": [],
-            "consumption_data": [],
-            "meter_readings": []
-        }
-        
-        # Extract utilities-specific information from segments
-        for segment in json_data.get("segments", []):
-            segment_type = segment.get("segment_type")
-            segment_data = segment.get("data", {})
-            
-            if segment_type == "LOC" and "location" in segment_data:
-                json_data["utilities_data"]["metering_points"].append(segment_data["location"])
-            elif segment_type == "QTY" and "quantity" in segment_data:
-                json_data["utilities_data"]["consumption_data"].append(segment_data["quantity"])
-            elif segment_type == "MEA" and "measurement" in segment_data:
-                json_data["utilities_data"]["meter_readings"].append(segment_data["measurement"])
-    
-    return json_data
+    return converter.convert_to_json(edi_data, message_type_hint="UTILMD")
 
 
 def convert_mscons_to_json(edi_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -287,29 +340,74 @@ def convert_mscons_to_json(edi_data: Dict[str, Any]) -> Dict[str, Any]:
         JSON structure optimized for consumption reporting
     """
     converter = EDIConverter()
-    json_data = converter.convert_to_json(edi_data)
+    return converter.convert_to_json(edi_data, message_type_hint="MSCONS")
+
+
+def convert_mscons_to_soa(edi_datas: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Collect the QTY quantities of many MSCONS messages as columns.
     
-    # Add MSCONS-specific processing
-    if json_data.get("message_type") == "MSCONS":
-        json_data["consumption_report"] = {
-            "reporting_period": {},
-            "meter_readings": [],
-            "consumption_totals": []
-        }
+    Args:
+        edi_datas: Parsed EDI messages; messages that are not MSCONS or have
+                   no QTY segment contribute no row
         
-        # Extract consumption-specific information
-        for segment in json_data.get("segments", []):
-            segment_type = segment.get("segment_type")
-            segment_data = segment.get("data", {})
-            
-            if segment_type == "DTM" and "date_time" in segment_data:
-                json_data["consumption_report"]["reporting_period"] = segment_data["date_time"]
-            elif segment_type == "QTY" and "quantity" in segment_data:
-                json_data["consumption_report"]["consumption_totals"].append(segment_data["quantity"])
-            elif segment_type == "MEA" and "measurement" in segment_data:
-                json_data["consumption_report"]["meter_readings"].append(segment_data["measurement"])
+    Returns:
+        Equal-length columns "message_reference", "metering_point", "qualifier"
+        and "unit" (lists) and "value" (array of doubles, NaN where missing),
+        e.g. for numpy.frombuffer without a copy
+    """
+    determine_type = EDIConverter()._determine_message_type
+    references: List[Any] = []
+    metering_points: List[Any] = []
+    qualifiers: List[Any] = []
+    units: List[Any] = []
+    values = array('d')
+    nan = math.nan
+    
+    for edi_data in edi_datas:
+        if determine_type(edi_data) != "MSCONS":
+            continue
+        quantity = _convert_segment('QTY', edi_data.get('QTY'))['quantity']
+        if not isinstance(quantity, dict):
+            continue
+        location = _convert_segment('LOC', edi_data.get('LOC'))['location']
+        unh_data = edi_data['UNH']
+        
+        references.append(unh_data[0] if isinstance(unh_data, list) else unh_data.get('reference_number'))
+        metering_points.append(location['identification'] if isinstance(location, dict) else None)
+        qualifiers.append(quantity['qualifier'])
+        units.append(quantity['unit'])
+        value = quantity['value']
+        values.append(nan if value is None else value)
     
-    return json_data
+    return {
+        "message_reference": references,
+        "metering_point": metering_points,
+        "qualifier": qualifiers,
+        "value": values,
+        "unit": units,
+    }
+
+
+def sum_consumption(consumption_totals: Iterable[Dict[str, Any]]) -> float:
+    """
+    Sum the quantity values of an MSCONS consumption report.
+    
+    Args:
+        consumption_totals: The report's "consumption_totals" entries
+        
+    Returns:
+        Total of all values; entries without a value are skipped
+    """
+    # Extracting values from the dicts dominates; an exact fsum over them is as
+    # fast as a NumPy or JIT kernel once the array would have to be built
+    return math.fsum([total["value"] for total in consumption_totals if total.get("value") is not None])
+
+
+# Fields required by the JSONValidator checks
+_REQUIRED_BASIC = frozenset(("message_type", "timestamp", "header", "body", "segments", "metadata"))
+_REQUIRED_UTILITIES = frozenset(("metering_points", "consumption_data", "meter_readings"))
+_REQUIRED_REPORT = frozenset(("reporting_period", "meter_readings", "consumption_totals"))
 
 
 class JSONValidator:
@@ -328,8 +426,7 @@ class JSONValidator:
         Returns:
             True if structure is valid, False otherwise
         """
-        required_fields = ["message_type", "timestamp", "header", "body", "segments", "metadata"]
-        return all(field in json_data for field in required_fields)
+        return _REQUIRED_BASIC.issubset(json_data)
     
     @staticmethod
     def validate_utilmd_structure(json_data: Dict[str, Any]) -> bool:
@@ -348,9 +445,7 @@ class JSONValidator:
         if json_data.get("message_type") != "UTILMD":
             return False
         
-        utilities_data = json_data.get("utilities_data", {})
-        required_utilities_fields = ["metering_points", "consumption_data", "meter_readings"]
-        return all(field in utilities_data for field in required_utilities_fields)
+        return _REQUIRED_UTILITIES.issubset(json_data.get("utilities_data", ()))
     
     @staticmethod
     def validate_mscons_structure(json_data: Dict[str, Any]) -> bool:
@@ -369,15 +464,18 @@ class JSONValidator:
         if json_data.get("message_type") != "MSCONS":
             return False
         
-        consumption_report = json_data.get("consumption_report", {})
-        required_report_fields = ["reporting_period", "meter_readings", "consumption_totals"]
-        return all(field in consumption_report for field in required_report_fields)
+        return _REQUIRED_REPORT.issubset(json_data.get("consumption_report", ()))
 
 
 def pretty_print_json(json_data: Dict[str, Any], indent: int = 2) -> str:
     """
     Pretty print JSON data for debugging and logging.
     
+    With orjson installed and the default indent, orjson formats the output.
+    It is equivalent JSON but not byte-identical to json.dumps: floats use
+    their shortest form (1e16 rather than 1e+16) and NaN/Infinity are
+    written as null.
+    
     Args:
         json_data: JSON data to format
         indent: Number of spaces for indentation
@@ -385,4 +483,32 @@ def pretty_print_json(json_data: Dict[str, Any], indent: int = 2) -> str:
     Returns:
         Formatted JSON string
     """
+    if orjson is not None and indent == 2:
+        try:
+            return orjson.dumps(json_data, default=str, option=_ORJSON_PRETTY).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which stdlib json handles
+            pass
     return json.dumps(json_data, indent=indent, ensure_ascii=False, default=str)
+
+
+def to_json_bytes(json_data: Dict[str, Any]) -> bytes:
+    """
+    Serialize converted JSON data compactly as UTF-8 bytes for transport or storage.
+    
+    Values JSON cannot represent (e.g. datetimes) are written as str(value),
+    as with json.dumps(default=str).
+    
+    Args:
+        json_data: JSON data to encode
+        
+    Returns:
+        Compact UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(json_data, default=str, option=_ORJSON_COMPAT)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which stdlib json handles
+            pass
+    return json.dumps(json_data, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
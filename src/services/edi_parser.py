@@ -1,12 +1,58 @@
 import re
+import sys
+import math
+import functools
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import IO, Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime
 from enum import Enum
 
 
 logger = logging.getLogger(__name__)
 
+# Characters read per step when parsing from a file-like object
+READ_CHUNK_SIZE = 65536
+
+# Whitespace runs collapsed to one space once line breaks are removed
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=8)
+def _segment_pattern(segment_separator: str, escape_character: str) -> "re.Pattern[str]":
+    """
+    Regex matching one segment in a single scan: runs of escaped characters
+    (e.g. ?') or anything but the segment separator.
+    """
+    return re.compile(
+        f"(?:{re.escape(escape_character)}[\\s\\S]|[^{re.escape(segment_separator)}])+"
+    )
+
+
+def parse_decimal(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an EDIFACT numeric value, accepting a decimal comma as well as a
+    decimal point. Empty values, text, NaN and infinity give None.
+    """
+    if not value:
+        return None
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        try:
+            number = float(value.replace(',', '.'))
+        except (ValueError, AttributeError):
+            return None
+    return number if math.isfinite(number) else None
+
+
+def _maybe_float(value: Optional[str]) -> Union[float, str, None]:
+    """
+    Convert an EDIFACT numeric value to float via parse_decimal. Anything
+    else (empty values, text, NaN or infinity) is returned unchanged.
+    """
+    number = parse_decimal(value)
+    return value if number is None else number
+
 
 class EDIMessageType(str, Enum):
     """Enumeration of supported EDI message types"""
@@ -45,12 +91,29 @@ class EDIFACTParser:
         self.component_separator = ":"
         self.escape_character = "?"
         
-    def parse_edi_file(self, edi_content: str) -> Dict[str, Any]:
+        # Segment handlers used by _extract_message_structure: header segments
+        # whose parse result is stored under a top-level key, and segments
+        # that add to message_data themselves
+        self._header_handlers = {
+            "UNB": ("interchange_header", self._parse_unb_segment),
+            "UNH": ("message_header", self._parse_unh_segment),
+            "BGM": ("message_type", self._parse_bgm_segment),
+        }
+        self._handlers = {
+            "DTM": self._parse_dtm_segment,
+            "NAD": self._parse_nad_segment,
+            "LOC": self._parse_loc_segment,
+            "MEA": self._parse_mea_segment,
+            "QTY": self._parse_qty_segment,
+        }
+        
+    def parse_edi_file(self, edi_content: Union[str, IO[str]]) -> Dict[str, Any]:
         """
         Parse an EDI file and extract structured data
         
         Args:
-            edi_content: Raw EDI file content as string
+            edi_content: Raw EDI file content as string, or a text file object
+                         that is read in chunks
             
         Returns:
             Dictionary containing parsed EDI data
@@ -59,68 +122,69 @@ class EDIFACTParser:
             EDIParseError: If parsing fails
         """
         try:
-            # Clean and normalize the content
-            normalized_content = self._normalize_content(edi_content)
-            
-            # Split into segments
-            segments = self._split_segments(normalized_content)
-            
-            # Parse segments
-            parsed_segments = []
-            for segment in segments:
-                if segment.strip():
-                    parsed_segment = self._parse_segment(segment)
-                    parsed_segments.append(parsed_segment)
-            
-            # Extract message structure
-            message_data = self._extract_message_structure(parsed_segments)
+            # Parse segments as they are split off the input
+            message_data = self._extract_message_structure(self.iter_segments(edi_content))
             
             # Validate message structure
             self._validate_message_structure(message_data)
             
-            logger.info(f"Successfully parsed EDI message with {len(parsed_segments)} segments")
+            logger.info(f"Successfully parsed EDI message with {len(message_data['segments'])} segments")
             return message_data
             
         except Exception as e:
             logger.error(f"Failed to parse EDI file: {e}")
             raise EDIParseError(f"EDI parsing failed: {str(e)}")
     
-    def _normalize_content(self, content: str) -> str:
-        """Normalize EDI content by removing unnecessary whitespace and line breaks"""
-        # Remove line breaks and extra spaces, but preserve segment structure
-        normalized = re.sub(r'\r\n|\r|\n', '', content)
-        normalized = re.sub(r'\s+', ' ', normalized)
-        return normalized.strip()
-    
-    def _split_segments(self, content: str) -> List[str]:
-        """Split EDI content into individual segments"""
-        # Split by segment separator, but handle escaped separators
-        segments = []
-        current_segment = ""
-        i = 0
-        
-        while i < len(content):
-            char = content[i]
+    def iter_segments(self, stream: Union[str, IO[str], Iterable[str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield parsed segments from EDI content without holding it all in memory
+        
+        Args:
+            stream: Content as one string, a text file object (read in
+                    READ_CHUNK_SIZE pieces) or an iterable of text chunks
             
-            if char == self.escape_character and i + 1 < len(content):
-                # Escaped character, add both escape and next character
-                current_segment += char + content[i + 1]
-                i += 2
-            elif char == self.segment_separator:
-                # End of segment
-                if current_segment.strip():
-                    segments.append(current_segment.strip())
-                current_segment = ""
-                i += 1
-            else:
-                current_segment += char
-                i += 1
-        
-        # Add final segment if exists
-        if current_segment.strip():
-            segments.append(current_segment.strip())
-        
-        return segments
+        Yields:
+            Parsed segment dictionaries, in input order
+        """
+        pattern = _segment_pattern(self.segment_separator, self.escape_character)
+        if isinstance(stream, str):
+            # Everything is in memory already, so there is no tail to carry
+            for segment in pattern.findall(self._collapse_whitespace(stream)):
+                segment = segment.strip()
+                if segment:
+                    yield self._parse_segment(segment)
+            return
+        
+        if hasattr(stream, "read"):
+            chunks: Iterable[str] = iter(functools.partial(stream.read, READ_CHUNK_SIZE), "")
+        else:
+            chunks = stream
+        
+        carry = ""
+        for chunk in chunks:
+            # Whitespace is collapsed across chunk boundaries because the
+            # unterminated tail is carried into the next buffer
+            buffer = self._collapse_whitespace(carry + chunk)
+            buffer_end = carry_start = len(buffer)
+            for match in pattern.finditer(buffer):
+                if match.end() == buffer_end:
+                    # Unterminated tail; its end may be in the next chunk
+                    carry_start = match.start()
+                    break
+                segment = match.group().strip()
+                if segment:
+                    yield self._parse_segment(segment)
+            carry = buffer[carry_start:]
+        
+        # Final segment without a terminator
+        segment = carry.strip()
+        if segment:
+            yield self._parse_segment(segment)
+    
+    def _collapse_whitespace(self, content: str) -> str:
+        """Remove line breaks and collapse whitespace runs, preserving segment structure"""
+        normalized = content.replace('\r', '').replace('\n', '')
+        return _WHITESPACE_RE.sub(' ', normalized)
     
     def _parse_segment(self, segment: str) -> Dict[str, Any]:
         """Parse a single EDI segment into structured data"""
@@ -130,58 +194,82 @@ class EDIFACTParser:
         # Split segment into elements
         elements = segment.split(self.element_separator)
         
-        if not elements:
-            raise EDIParseError(f"Invalid segment format: {segment}")
-        
-        segment_tag = elements[0]
-        segment_elements = elements[1:] if len(elements) > 1 else []
+        # Tags come from a small fixed vocabulary; interned, they share one
+        # object and hash across all segments
+        segment_tag = sys.intern(elements[0])
         
-        # Parse each element into components
-        parsed_elements = []
-        for element in segment_elements:
-            if self.component_separator in element:
-                components = element.split(self.component_separator)
-                parsed_elements.append(components)
-            else:
-                parsed_elements.append(element)
+        # Split composite elements into components in place; one scan of the
+        # whole segment skips the per-element checks when there are none
+        del elements[0]
+        component_separator = self.component_separator
+        if component_separator in segment:
+            for i, element in enumerate(elements):
+                if component_separator in element:
+                    elements[i] = element.split(component_separator)
         
+        # The source text is not kept; format_segment rebuilds it on demand
         return {
             "tag": segment_tag,
-            "elements": parsed_elements,
-            "raw": segment
+            "elements": elements
         }
     
-    def _extract_message_structure(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Extract high-level message structure from parsed segments"""
+    def format_segment(self, segment: Dict[str, Any]) -> str:
+        """
+        Rebuild the (whitespace-normalized) EDI text of a parsed segment
+        
+        Args:
+            segment: Segment dictionary as produced by the parser
+            
+        Returns:
+            Segment text without the segment terminator
+        """
+        component_separator = self.component_separator
+        return self.element_separator.join([segment["tag"]] + [
+            component_separator.join(element) if isinstance(element, list) else element
+            for element in segment["elements"]
+        ])
+    
+    def _extract_message_structure(
+        self,
+        segments: Iterable[Dict[str, Any]],
+        parsed_at: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract high-level message structure from parsed segments, consumed one at a time
+        
+        Args:
+            segments: Parsed segments, e.g. from iter_segments
+            parsed_at: ISO timestamp given to all readings of the message
+                       (current UTC time if not provided)
+        """
+        if parsed_at is None:
+            parsed_at = datetime.utcnow().isoformat()
+        
+        parsed_segments: List[Dict[str, Any]] = []
         message_data = {
             "interchange_header": None,
             "message_header": None,
             "message_type": None,
-            "segments": segments,
+            "segments": parsed_segments,
             "readings": [],
-            "metadata": {}
+            "metadata": {"parsed_at": parsed_at}
         }
         
+        append = parsed_segments.append
+        get_handler = self._handlers.get
+        get_header_handler = self._header_handlers.get
         for segment in segments:
+            append(segment)
             tag = segment["tag"]
-            elements = segment["elements"]
             
-            if tag == "UNB":
-                message_data["interchange_header"] = self._parse_unb_segment(segment)
-            elif tag == "UNH":
-                message_data["message_header"] = self._parse_unh_segment(segment)
-            elif tag == "BGM":
-                message_data["message_type"] = self._parse_bgm_segment(segment)
-            elif tag == "DTM":
-                self._parse_dtm_segment(segment, message_data)
-            elif tag == "NAD":
-                self._parse_nad_segment(segment, message_data)
-            elif tag == "LOC":
-                self._parse_loc_segment(segment, message_data)
-            elif tag == "MEA":
-                self._parse_mea_segment(segment, message_data)
-            elif tag == "QTY":
-                self._parse_qty_segment(segment, message_data)
+            handler = get_handler(tag)
+            if handler is not None:
+                handler(segment, message_data)
+                continue
+            header_handler = get_header_handler(tag)
+            if header_handler is not None:
+                key, parse = header_handler
+                message_data[key] = parse(segment)
         
         return message_data
     
@@ -291,9 +379,9 @@ class EDIFACTParser:
             
             quantity_data = {
                 "qualifier": qty_qualifier,
-                "value": float(qty_value) if qty_value and qty_value.replace('.', '').replace('-', '').isdigit() else qty_value,
+                "value": _maybe_float(qty_value),
                 "unit": qty_unit,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": message_data["metadata"].get("parsed_at")
             }
             
             message_data["readings"].append(quantity_data)
@@ -325,6 +413,10 @@ class EDIFACTParser:
             List of meter reading dictionaries
         """
         readings = []
+        # Readings without their own timestamp share the one from the parse
+        default_timestamp = (
+            parsed_data.get("metadata", {}).get("parsed_at") or datetime.utcnow().isoformat()
+        )
         
         for reading_data in parsed_data.get("readings", []):
             if "value" in reading_data and reading_data["value"] is not None:
@@ -333,7 +425,7 @@ class EDIFACTParser:
                 
                 reading = {
                     "metering_point": metering_point,
-                    "timestamp": reading_data.get("timestamp", datetime.utcnow().isoformat()),
+                    "timestamp": reading_data.get("timestamp") or default_timestamp,
                     "value_kwh": reading_data["value"],
                     "reading_type": self._determine_reading_type(reading_data),
                     "source": "EDI",
@@ -10,9 +10,28 @@ import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from src.services.edi_converter import to_json_bytes
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON codec, stdlib json is used without it
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize a message payload to compact JSON bytes."""
+    return to_json_bytes(payload)
+
+
+def _loads(body: bytes) -> Dict[str, Any]:
+    """Deserialize a JSON message body without decoding it to str first."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
 class EDIProcessor:
     """
     Service for processing and publishing EDI messages through the message bus.
@@ -21,13 +40,16 @@ class EDIProcessor:
     def __init__(self):
         self.processor_id = "edi_processor"
     
-    async def publish_parsed_edi(self, parsed_data: Dict[str, Any], message_type: str = "UTILMD") -> bool:
+    async def publish_parsed_edi(self, parsed_data: Dict[str, Any], message_type: str = "UTILMD",
+                                 timestamp: Optional[str] = None) -> bool:
         """
         Publish parsed EDI data to the message queue for processing.
         
         Args:
             parsed_data: The parsed EDI data structure
             message_type: Type of EDI message (UTILMD, MSCONS, etc.)
+            timestamp: ISO timestamp for the message; pass one to share it
+                       across a batch. Defaults to the current UTC time.
             
         Returns:
             bool: True if published successfully, False otherwise
@@ -42,7 +64,7 @@ class EDIProcessor:
                 "message_type": message_type,
                 "sender_id": self._extract_sender_id(parsed_data),
                 "recipient_id": self._extract_recipient_id(parsed_data),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp or datetime.utcnow().isoformat(),
                 "parsed_data": parsed_data,
                 "processing_status": "pending",
                 "event_type": "edi_message_received"
@@ -54,7 +76,7 @@ class EDIProcessor:
             # Publish to EDI processing queue
             await publish_message(
                 routing_key=routing_key,
-                message_body=message_payload
+                message_body=_dumps(message_payload)
             )
             
             logger.info(f"Published EDI message {message_payload['message_id']} to queue")
@@ -64,13 +86,15 @@ class EDIProcessor:
             logger.error(f"Failed to publish EDI message: {e}")
             return False
     
-    async def publish_aperak_response(self, aperak_message: str, original_message_id: str) -> bool:
+    async def publish_aperak_response(self, aperak_message: str, original_message_id: str,
+                                      timestamp: Optional[str] = None) -> bool:
         """
         Publish APERAK response message.
         
         Args:
             aperak_message: The generated APERAK message
             original_message_id: ID of the original message being acknowledged
+            timestamp: ISO timestamp for the message. Defaults to the current UTC time.
             
         Returns:
             bool: True if published successfully, False otherwise
@@ -81,13 +105,13 @@ class EDIProcessor:
             message_payload = {
                 "aperak_message": aperak_message,
                 "original_message_id": original_message_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp or datetime.utcnow().isoformat(),
                 "event_type": "aperak_generated"
             }
             
             await publish_message(
                 routing_key="edi.aperak.generated",
-                message_body=message_payload
+                message_body=_dumps(message_payload)
             )
             
             logger.info(f"Published APERAK response for message {original_message_id}")
@@ -242,13 +266,11 @@ async def setup_edi_consumer():
         
         async def message_handler(message):
             """Handle incoming EDI messages"""
-            import json
-            
             async with async_session() as session:
                 consumer = EDIMessageConsumer(session)
                 
                 try:
-                    message_body = json.loads(message.body.decode())
+                    message_body = _loads(message.body)
                     await consumer.process_edi_message(message_body)
                     await message.ack()
                     
@@ -0,0 +1,216 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from lxml import etree
+from src.services.as4 import AS4Error, AS4Manager, AS4Security, AS4Message, AS4Server
+
+try:
+    import xmlsec
+except ImportError:
+    xmlsec = None
+
+
+def make_certificate(directory: Path, common_name: str, issuer=None, valid_days: int = 30):
+    """Write a certificate and its key, return their paths
+    
+    The certificate is self-signed unless issuer gives the (cert path, key path)
+    of the issuing certificate.
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    issuer_name, signing_key = name, key
+    if issuer is not None:
+        issuer_name = x509.load_pem_x509_certificate(issuer[0].read_bytes()).subject
+        signing_key = serialization.load_pem_private_key(issuer[1].read_bytes(), password=None)
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(issuer_name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=valid_days))
+        .sign(signing_key, hashes.SHA256())
+    )
+    cert_path = directory / f"{common_name}_cert.pem"
+    key_path = directory / f"{common_name}_key.pem"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ))
+    return cert_path, key_path
+
+
+def sign_envelope(envelope: bytes, key_path: Path) -> bytes:
+    """Sign the envelope's ds:Signature template with the given key"""
+    root = etree.fromstring(envelope)
+    xmlsec.tree.add_ids(root, ["Id"])
+    ctx = xmlsec.SignatureContext()
+    ctx.key = xmlsec.Key.from_file(str(key_path), xmlsec.constants.KeyDataFormatPem)
+    ctx.sign(xmlsec.tree.find_node(root, xmlsec.constants.NodeSignature))
+    return etree.tostring(root)
+
+
+@pytest.mark.skipif(xmlsec is None, reason="python-xmlsec is not installed")
+class TestAS4SignatureVerification:
+    """Test suite for AS4 message signature verification"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a partner identity and a signed envelope from it"""
+        cert_path, key_path = make_certificate(tmp_path, "PARTNER")
+        self.partner_chain = cert_path.read_bytes()
+        self.security = AS4Security(str(cert_path), str(key_path))
+        assert self.security.load_certificates()
+        
+        message = AS4Message(
+            message_id="MSG-1",
+            conversation_id="CONV-1",
+            from_party_id="PARTNER",
+            from_party_type="urn:test",
+            to_party_id="COMAKO",
+            to_party_type="urn:test",
+            service="svc",
+            action="act",
+            payload=b"UNB+UNOC:3+PARTNER+COMAKO'"
+        )
+        security_header = self.security.create_security_header("MSG-1", body_digest=message.calculate_digest())
+        self.signed = sign_envelope(bytes(message.create_soap_envelope(security_header)), key_path)
+    
+    def test_signed_message_accepted(self):
+        """Test a message signed with the partner key verifies"""
+        assert self.security.verify_signature(self.signed, self.partner_chain) is True
+    
+    def test_stripped_signature_rejected(self):
+        """Test removing ds:Signature from a partner message fails verification"""
+        root = etree.fromstring(self.signed)
+        signature = xmlsec.tree.find_node(root, xmlsec.constants.NodeSignature)
+        signature.getparent().remove(signature)
+        
+        assert self.security.verify_signature(etree.tostring(root), self.partner_chain) is False
+    
+    def test_tampered_body_rejected(self):
+        """Test changing the signed payload fails verification"""
+        tampered = self.signed.replace(b"VU5CK1VOT0M6", b"VU5CK0VWSUw6", 1)
+        assert tampered != self.signed
+        
+        assert self.security.verify_signature(tampered, self.partner_chain) is False
+
+
+class TestAS4SignatureWithoutXmlsec:
+    """Test suite for signature verification when python-xmlsec is missing"""
+    
+    def test_configured_partner_rejected(self, monkeypatch):
+        """Test messages from a partner with a chain are rejected without xmlsec"""
+        monkeypatch.setattr("src.services.as4.xmlsec", None)
+        security = AS4Security("cert.pem", "key.pem")
+        
+        assert security.verify_signature(b"<soap:Envelope/>", b"PARTNER CHAIN") is False
+    
+    def test_unconfigured_partner_accepted(self, monkeypatch):
+        """Test messages from a partner without a chain are not checked"""
+        monkeypatch.setattr("src.services.as4.xmlsec", None)
+        security = AS4Security("cert.pem", "key.pem")
+        
+        assert security.verify_signature(b"<soap:Envelope/>") is True
+
+
+class TestCertificateChainValidation:
+    """Test suite for partner certificate chain validation"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Set up a root CA, a partner certificate it issued and an unrelated root"""
+        self.tmp_path = tmp_path
+        self.root = make_certificate(tmp_path, "ROOT")
+        self.other_root = make_certificate(tmp_path, "OTHER_ROOT")
+        partner_cert, _ = make_certificate(tmp_path, "PARTNER", issuer=self.root)
+        self.chain = partner_cert.read_bytes() + self.root[0].read_bytes()
+        self.leaf_only = partner_cert.read_bytes()
+    
+    def test_chain_to_trust_anchor(self):
+        """Test chains ending at or issued by a trust anchor are accepted"""
+        security = AS4Security("cert.pem", "key.pem", str(self.root[0]))
+        assert security.validate_certificate_chain(self.chain) is not None
+        assert security.validate_certificate_chain(self.leaf_only) is not None
+    
+    def test_chain_to_untrusted_root_rejected(self):
+        """Test a consistent chain that does not lead to a trust anchor is rejected"""
+        security = AS4Security("cert.pem", "key.pem", str(self.other_root[0]))
+        with pytest.raises(AS4Error, match="trusted root"):
+            security.validate_certificate_chain(self.chain)
+    
+    def test_chain_without_trust_anchors(self):
+        """Test the configured chain is trusted as installed when no anchors are set"""
+        security = AS4Security("cert.pem", "key.pem")
+        assert security.validate_certificate_chain(self.chain) is not None
+    
+    def test_expired_chain_rejected(self):
+        """Test a chain outside its validity period is rejected"""
+        expired_cert, _ = make_certificate(self.tmp_path, "EXPIRED", valid_days=-1)
+        security = AS4Security("cert.pem", "key.pem")
+        with pytest.raises(AS4Error, match="not valid at this time"):
+            security.validate_certificate_chain(expired_cert.read_bytes())
+    
+    @pytest.mark.asyncio
+    async def test_send_ignores_partner_chain(self):
+        """Test sends go out even if the partner's configured chain is expired"""
+        expired_cert, _ = make_certificate(self.tmp_path, "EXPIRED", valid_days=-1)
+        manager = AS4Manager(str(self.tmp_path / "as4" / "cert.pem"), str(self.tmp_path / "as4" / "key.pem"))
+        manager.add_partner("PARTNER", "urn:test", "Partner", "https://partner.example/as4", "svc",
+                            certificate_path=str(expired_cert))
+        
+        result = await manager.send_edi_message("PARTNER", "UNB+UNOC:3+COMAKO+PARTNER'")
+        assert result["status"] == "success"
+
+
+class TestAS4ServerEnvelopeSize:
+    """Test suite for the inbound SOAP envelope size limit"""
+    
+    def make_envelope(self, payload: bytes) -> bytes:
+        """Build an unsigned envelope carrying the given payload"""
+        security = AS4Security("cert.pem", "key.pem")
+        message = AS4Message(
+            message_id="MSG-LARGE",
+            conversation_id="CONV-1",
+            from_party_id="PARTNER",
+            from_party_type="urn:test",
+            to_party_id="COMAKO",
+            to_party_type="urn:test",
+            service="svc",
+            action="act",
+            payload=payload
+        )
+        return bytes(message.create_soap_envelope(security.create_security_header("MSG-LARGE")))
+    
+    @pytest.mark.asyncio
+    async def test_envelope_above_default_limit_rejected(self):
+        """Test envelopes above the default limit are rejected"""
+        server = AS4Server(AS4Security("cert.pem", "key.pem"), retain_payload=True)
+        
+        response = await server.process_soap_message(self.make_envelope(b"x" * (8 * 1024 * 1024)), {})
+        
+        assert "exceeds the limit" in response
+        assert server.messages_received == 0
+    
+    @pytest.mark.asyncio
+    async def test_raised_limit_accepts_large_payload(self):
+        """Test a raised limit admits payloads beyond libxml2's default text node size"""
+        payload = b"x" * (8 * 1024 * 1024)
+        server = AS4Server(AS4Security("cert.pem", "key.pem"), retain_payload=True,
+                           max_envelope_size=32 * 1024 * 1024)
+        
+        await server.process_soap_message(self.make_envelope(payload), {})
+        
+        assert server.messages_received == 1
+        assert server.received_messages[0].payload == payload
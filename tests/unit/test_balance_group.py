@@ -5,6 +5,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 import pytest
 import pytest_asyncio
 import asyncio
+from sqlalchemy.orm import selectinload
 from tests.unit.test_config import TestAsyncSession, Base
 from src.models.models import BalanceGroup, BalanceGroupMember, MarketParticipant
 from src.services.balance_group import BalanceGroupRepository
@@ -83,3 +84,36 @@ async def test_get_members(setup_database):
         members = await repo.get_members("BG123")
         assert len(members) == 1
         assert members[0].id == "MP456"
+
+@pytest.mark.asyncio
+async def test_get_members_eager_loads_relationships(setup_database):
+    async with TestAsyncSession() as session:
+        repo = BalanceGroupRepository(session)
+        await repo.create_balance_group("BG123", "Test Group")
+        participant = MarketParticipant(id="MP456", name="Test Participant")
+        session.add(participant)
+        await session.commit()
+        await repo.add_member("BG123", "MP456")
+
+        members = await repo.get_members(
+            "BG123", options=[selectinload(MarketParticipant.metering_points)]
+        )
+        assert len(members) == 1
+        # Loaded up front, so no lazy load is needed on the async session
+        assert members[0].metering_points == []
+
+@pytest.mark.asyncio
+async def test_add_members_bulk(setup_database):
+    async with TestAsyncSession() as session:
+        repo = BalanceGroupRepository(session)
+        await repo.create_balance_group("BG123", "Test Group")
+        session.add_all([MarketParticipant(id=f"MP{i}", name=f"Participant {i}") for i in range(3)])
+        await session.commit()
+        await repo.add_member("BG123", "MP0")
+
+        added = await repo.add_members_bulk("BG123", ["MP0", "MP1", "MP2", "MP1", "UNKNOWN"])
+        assert added == ["MP1", "MP2"]
+
+        members = await repo.get_members("BG123")
+        assert sorted(m.id for m in members) == ["MP0", "MP1", "MP2"]
+        assert await repo.add_members_bulk("BG999", ["MP1"]) == []
@@ -1,5 +1,6 @@
 import pytest
-from src.services.deviation import calculate_deviation, calculate_deviation_percentage
+import numpy as np
+from src.services.deviation import calculate_deviation, calculate_deviation_percentage, calculate_deviation_percentage_array
 
 def test_calculate_deviation():
     actual = 100.0
@@ -18,3 +19,10 @@ def test_calculate_deviation_percentage_zero_forecast():
     forecast = 0.0
     deviation_percentage = calculate_deviation_percentage(actual, forecast)
     assert deviation_percentage == float('inf')
+
+def test_calculate_deviation_percentage_array():
+    actual = np.array([100.0, 100.0, 0.0, -5.0])
+    forecast = np.array([90.0, 0.0, 0.0, 0.0])
+    result = calculate_deviation_percentage_array(actual, forecast)
+    expected = [calculate_deviation_percentage(a, f) for a, f in zip(actual, forecast)]
+    assert np.allclose(result, expected)
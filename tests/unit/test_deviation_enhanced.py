@@ -4,6 +4,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 import pytest
 import math
+import pandas as pd
 from src.services.deviation import (
     calculate_deviation, 
     calculate_deviation_percentage,
@@ -256,6 +257,97 @@ class TestDeviationAnalyzer:
         assert df['deviation_kwh'].is_monotonic_increasing
 
 
+    def test_deviation_analyzer_from_arrow(self):
+        """Test building the analyzer from Arrow tables"""
+        pa = pytest.importorskip("pyarrow")
+        readings_data = [
+            {'metering_point_id': 'MP1', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': 100},
+            {'metering_point_id': 'MP2', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': 50},
+        ]
+        forecast_data = [
+            {'metering_point_id': 'MP1', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': 95},
+        ]
+        analyzer = DeviationAnalyzer.from_arrow(pa.Table.from_pylist(readings_data), pa.Table.from_pylist(forecast_data))
+        expected = DeviationAnalyzer(readings_data, forecast_data)
+        assert analyzer.readings_df.equals(expected.readings_df)
+        assert analyzer.get_top_contributors() == {'MP2': 50.0, 'MP1': 5.0}
+
+    def test_deviation_analyzer_portfolio_sorted(self):
+        """Test that portfolio deviations are ordered by timestamp"""
+        readings_data = [
+            {'metering_point_id': 'MP2', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': 10},
+            {'metering_point_id': 'MP1', 'timestamp': '2023-01-01T01:00:00Z', 'value_kwh': 20},
+        ]
+        analyzer = DeviationAnalyzer(readings_data, readings_data)
+        df = analyzer.calculate_portfolio_deviation()
+        assert df.index.is_monotonic_increasing
+        assert df['actual_kwh'].to_list() == [10.0, 20.0]
+
+    def test_deviation_analyzer_register_precision(self):
+        """Test that register-sized meter values keep their decimals"""
+        timestamps = [f'2023-01-01T{hour:02d}:00:00Z' for hour in range(24)]
+        readings_data = [
+            {'metering_point_id': 'MP1', 'timestamp': ts, 'value_kwh': 1234567.891} for ts in timestamps
+        ]
+        forecast_data = [
+            {'metering_point_id': 'MP1', 'timestamp': ts, 'value_kwh': 1234567.001} for ts in timestamps
+        ]
+        analyzer = DeviationAnalyzer(readings_data, forecast_data)
+        df = analyzer.calculate_portfolio_deviation()
+        assert df['deviation_kwh'].to_list() == pytest.approx([0.89] * 24)
+        assert analyzer.get_top_contributors()['MP1'] == pytest.approx(21.36)
+
+    def test_deviation_analyzer_top_contributors_ties(self):
+        """Test that tied deviations are picked and ordered like nlargest"""
+        deviations = [3, 5, 5, 1, 5, 3, 5, 0, 3]
+        readings_data = [
+            {'metering_point_id': f'MP{i}', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': value}
+            for i, value in enumerate(deviations)
+        ]
+        analyzer = DeviationAnalyzer(readings_data, [])
+        expected = pd.Series(
+            [float(value) for value in deviations], index=[f'MP{i}' for i in range(len(deviations))]
+        )
+        for n in range(len(deviations) + 1):
+            top = analyzer.get_top_contributors(n)
+            assert list(top.items()) == list(expected.nlargest(n).items())
+        assert list(analyzer.get_top_contributors(3)) == ['MP1', 'MP2', 'MP4']
+
+    def test_deviation_analyzer_keeps_timezone_awareness(self):
+        """Test that naive timestamps stay naive and aware ones keep their zone"""
+        naive_data = [
+            {'metering_point_id': 'MP1', 'timestamp': '2023-01-01T00:00:00', 'value_kwh': 100},
+        ]
+        df = DeviationAnalyzer(naive_data, naive_data).calculate_portfolio_deviation()
+        assert df.index.tz is None
+        assert df.index[0] == pd.Timestamp('2023-01-01T00:00:00')
+
+        utc_data = [
+            {'metering_point_id': 'MP1', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': 100},
+        ]
+        df = DeviationAnalyzer(utc_data, utc_data).calculate_portfolio_deviation()
+        assert str(df.index.tz) == 'UTC'
+
+    def test_deviation_analyzer_caches_results(self):
+        """Test that results are reused until the inputs are replaced"""
+        readings_data = [
+            {'metering_point_id': 'MP1', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': 100},
+        ]
+        forecast_data = [
+            {'metering_point_id': 'MP1', 'timestamp': '2023-01-01T00:00:00Z', 'value_kwh': 95},
+        ]
+        analyzer = DeviationAnalyzer(readings_data, forecast_data)
+        df = analyzer.calculate_portfolio_deviation()
+        assert analyzer.calculate_portfolio_deviation().equals(df)
+
+        # Callers get their own copy of the cached frame
+        df['deviation_kwh'] = 0.0
+        assert analyzer.calculate_portfolio_deviation()['deviation_kwh'].iloc[0] == 5.0
+
+        analyzer.forecast_df = analyzer.forecast_df.iloc[0:0]
+        assert analyzer.calculate_portfolio_deviation()['deviation_kwh'].iloc[0] == 100.0
+        assert analyzer.get_top_contributors() == {'MP1': 100.0}
+
 class TestDeviationValidation:
     """Test suite for deviation calculation validation"""
     
@@ -0,0 +1,209 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pickle
+import pytest
+from datetime import date
+from decimal import Decimal
+from lxml import etree
+from src.services.e_invoice import (
+    RAM_NS,
+    RSM_NS,
+    EInvoiceManager,
+    InvoiceLineItem,
+    PartyInfo,
+    TaxInfo,
+    XRechnungGenerator,
+    get_comako_party_info
+)
+
+
+class TestEInvoice:
+    """Test suite for EInvoice totals and serialization"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = EInvoiceManager(get_comako_party_info())
+        self.customer = PartyInfo(
+            name="Max Mustermann",
+            address_line1="Kundenweg 1",
+            postal_code="54321",
+            city="Kundenstadt"
+        )
+
+    def _create_bill(self, consumption_kwh="350.5"):
+        return self.manager.create_customer_bill(
+            customer_info=self.customer,
+            consumption_kwh=Decimal(consumption_kwh),
+            price_per_kwh=Decimal("0.32"),
+            billing_period_start=date(2025, 1, 1),
+            billing_period_end=date(2025, 1, 31),
+            metering_point_id="DE0001234567890"
+        )
+
+    def test_totals(self):
+        """Test totals of a customer bill"""
+        invoice = self._create_bill()
+
+        assert invoice.total_net_amount == Decimal("118.06")
+        assert invoice.total_tax_amount == Decimal("22.43")
+        assert invoice.total_gross_amount == Decimal("140.49")
+
+    def test_totals_follow_line_item_changes(self):
+        """Test totals after adding and removing line items"""
+        invoice = self._create_bill()
+        assert invoice.total_net_amount == Decimal("118.06")
+
+        invoice.add_line_item(InvoiceLineItem(
+            line_id="3",
+            description="Zählermiete",
+            quantity=Decimal("1"),
+            unit="MON",
+            unit_price=Decimal("2.00"),
+            tax_info=TaxInfo(Decimal("19.0"))
+        ))
+        assert invoice.total_net_amount == Decimal("120.06")
+
+        invoice.line_items.pop()
+        assert invoice.total_net_amount == Decimal("118.06")
+        assert invoice.get_tax_breakdown()["19.0"]["net_amount"] == Decimal("118.06")
+
+        invoice.line_items = invoice.line_items[:1]
+        assert invoice.total_net_amount == Decimal("112.16")
+
+    def test_totals_follow_replaced_line_item(self):
+        """Test that replacing a line item in place updates totals and tax breakdown"""
+        invoice = self._create_bill()
+        assert invoice.get_tax_breakdown()["19.0"]["net_amount"] == Decimal("118.06")
+
+        invoice.line_items[0] = InvoiceLineItem(
+            line_id="3",
+            description="Zählermiete",
+            quantity=Decimal("1"),
+            unit="MON",
+            unit_price=Decimal("2.00"),
+            tax_info=TaxInfo(Decimal("19.0"))
+        )
+        breakdown = invoice.get_tax_breakdown()["19.0"]
+        assert breakdown["net_amount"] == invoice.total_net_amount == Decimal("7.90")
+        assert breakdown["tax_amount"] == invoice.total_tax_amount
+
+        data = invoice.to_dict()
+        assert data["totals"]["net_amount"] == 7.90
+        assert data["tax_breakdown"]["19.0"]["net_amount"] == 7.90
+
+    def test_statistics_follow_line_item_changes(self):
+        """Test that statistics track invoices without retaining them"""
+        invoice = self._create_bill()
+        self._create_bill("100")
+        assert not hasattr(self.manager, "generated_invoices")
+
+        invoice.add_line_items([InvoiceLineItem(
+            line_id="3",
+            description="Zählermiete",
+            quantity=Decimal("1"),
+            unit="MON",
+            unit_price=Decimal("2.00"),
+            tax_info=TaxInfo(Decimal("19.0"))
+        )])
+        stats = self.manager.get_invoice_statistics()
+
+        assert stats["total_invoices"] == 2
+        assert stats["by_type"] == {"CUSTOMER_BILL": 2}
+        # 140.49 + 2.38 for the added item, plus 45.10 for the second bill
+        assert stats["total_amounts"] == {"CUSTOMER_BILL": 187.97}
+
+    def test_pickle_round_trip(self):
+        """Test that an invoice survives pickling unchanged"""
+        invoice = self._create_bill()
+        expected = invoice.to_dict()
+
+        restored = pickle.loads(pickle.dumps(invoice))
+
+        assert restored.to_dict() == expected
+        assert restored.total_gross_amount == invoice.total_gross_amount
+
+
+class TestXRechnungGenerator:
+    """Test suite for XRechnung XML generation and batch saving"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.generator = XRechnungGenerator()
+
+    def _create_invoices(self, manager):
+        customer = PartyInfo(
+            name="Max Mustermann",
+            address_line1="Kundenweg 1",
+            postal_code="54321",
+            city="Kundenstadt",
+            vat_id="DE999999999"
+        )
+        return [
+            manager.create_customer_bill(
+                customer_info=customer,
+                consumption_kwh=Decimal("350.5"),
+                price_per_kwh=Decimal("0.32"),
+                billing_period_start=date(2025, 1, 1),
+                billing_period_end=date(2025, 1, 31),
+                metering_point_id="DE0001234567890"
+            ),
+            manager.create_producer_credit(
+                producer_info=customer,
+                production_kwh=Decimal("1200"),
+                feed_in_tariff=Decimal("0.082"),
+                billing_period_start=date(2025, 1, 1),
+                billing_period_end=date(2025, 1, 31),
+                metering_point_id="DE0009876543210"
+            ),
+            manager.create_settlement_invoice(
+                party_info=customer,
+                settlement_amount=Decimal("-45.10"),
+                settlement_type="Mehrmenge",
+                reference_period_start=date(2025, 1, 1),
+                reference_period_end=date(2025, 1, 31),
+                reference_number="SETTLE-REF-1"
+            )
+        ]
+
+    def test_generate_xml(self):
+        """Test XRechnung content of a customer bill"""
+        manager = EInvoiceManager(get_comako_party_info())
+        invoice = self._create_invoices(manager)[0]
+
+        root = etree.fromstring(self.generator.generate_xml_bytes(invoice))
+        ns = {"rsm": RSM_NS, "ram": RAM_NS}
+
+        assert root.findtext("rsm:ExchangedDocument/ram:ID", namespaces=ns) == invoice.invoice_number
+        assert len(root.findall(".//ram:IncludedSupplyChainTradeLineItem", ns)) == 2
+        assert root.findtext(".//ram:GrandTotalAmount", namespaces=ns) == "140.49"
+        assert root.findtext(".//ram:BuyerTradeParty/ram:PostalTradeAddress/ram:CityName", namespaces=ns) == "Kundenstadt"
+        assert root.findtext(".//ram:BuyerTradeParty/ram:SpecifiedTaxRegistration/ram:ID", namespaces=ns) == "DE999999999"
+
+    def test_write_xml_matches_generate_xml(self, tmp_path):
+        """Test that streamed output equals the in-memory document"""
+        manager = EInvoiceManager(get_comako_party_info())
+        invoice = self._create_invoices(manager)[0]
+        filepath = tmp_path / "invoice.xml"
+
+        self.generator.write_xml(invoice, filepath)
+
+        assert filepath.read_bytes() == self.generator.generate_xml_bytes(invoice)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_save_batch(self, tmp_path, workers):
+        """Test batch saving serially and in worker processes"""
+        manager = EInvoiceManager(get_comako_party_info(), output_directory=str(tmp_path))
+        invoices = self._create_invoices(manager)
+        invoices[2].total_gross_amount = Decimal("53.00")
+
+        filepaths = manager.save_batch(invoices, workers=workers)
+
+        assert filepaths == [str(tmp_path / f"{invoice.invoice_number}.xml") for invoice in invoices]
+        for invoice, filepath in zip(invoices, filepaths):
+            assert Path(filepath).read_bytes() == self.generator.generate_xml_bytes(invoice)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -2,6 +2,7 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+import json
 import pytest
 from datetime import datetime
 from src.services.edi_converter import (
@@ -10,7 +11,10 @@ from src.services.edi_converter import (
     convert_utilmd_to_json, 
     convert_mscons_to_json,
     JSONValidator,
-    pretty_print_json
+    pretty_print_json,
+    sum_consumption,
+    to_json_bytes,
+    convert_mscons_to_soa
 )
 
 
@@ -58,6 +62,19 @@ class TestEDIConverter:
         for segment in expected_segments:
             assert segment in converter.segment_mappings
     
+    def test_segment_mappings_per_instance(self):
+        """Test segment mappings are per instance and honour subclass overrides"""
+        class CustomConverter(EDIConverter):
+            def _convert_qty_segment(self, segment_data):
+                return {"quantity": "custom"}
+        
+        converter = EDIConverter()
+        del converter.segment_mappings['QTY']
+        assert 'QTY' in EDIConverter().segment_mappings
+        
+        result = CustomConverter().convert_to_json({'QTY': ['220', '1500.5', 'KWH']})
+        assert result["body"]["quantity"] == "custom"
+    
     def test_basic_edi_conversion(self):
         """Test basic EDI to JSON conversion"""
         result = self.converter.convert_to_json(self.sample_edi_data)
@@ -259,6 +276,18 @@ class TestEDIConverter:
             }
         }
         assert result == expected
+    
+    def test_malformed_numeric_values(self):
+        """Test malformed QTY/MEA values become None instead of failing the conversion"""
+        result = self.converter._convert_qty_segment(['220', 'n/a', 'KWH'])
+        assert result["quantity"]["value"] is None
+        
+        result = self.converter._convert_qty_segment(['220', 'nan', 'KWH'])
+        assert result["quantity"]["value"] is None
+        
+        # Decimal commas are accepted like in the parser
+        result = self.converter._convert_mea_segment(['AAE', 'KWH', '12,5', 'KWH'])
+        assert result["measurement"]["value"] == 12.5
 
 
 class TestConvenienceFunctions:
@@ -289,6 +318,26 @@ class TestConvenienceFunctions:
         assert 'segments' in result
         assert result['message_type'] == 'UTILMD'
     
+    def test_minimal_detail_level(self):
+        """Test minimal detail keeps merged sections but only unmapped segments"""
+        data = dict(self.sample_edi_data, XYZ=['unknown'])
+        full = EDIConverter().convert_to_json(data)
+        minimal = EDIConverter(detail_level="minimal").convert_to_json(data)
+        
+        assert minimal['header'] == full['header']
+        assert minimal['body'] == full['body']
+        assert minimal['segments'] == [full['segments'][-1]]
+        with pytest.raises(ValueError):
+            EDIConverter(detail_level="verbose")
+    
+    def test_convert_many(self):
+        """Test batch conversion shares one timestamp and keeps input order"""
+        results = EDIConverter.convert_many([self.sample_edi_data, self.mscons_edi_data])
+        
+        assert [r['message_type'] for r in results] == ['UTILMD', 'MSCONS']
+        assert results[0]['timestamp'] == results[1]['timestamp']
+        assert convert_edi_to_json([self.mscons_edi_data])[0]['body'] == results[1]['body']
+    
     def test_convert_utilmd_to_json_function(self):
         """Test UTILMD-specific conversion function"""
         result = convert_utilmd_to_json(self.sample_edi_data)
@@ -324,6 +373,24 @@ class TestConvenienceFunctions:
         assert len(consumption_report['consumption_totals']) == 1
         assert len(consumption_report['meter_readings']) == 1
     
+    def test_sum_consumption(self):
+        """Test summing MSCONS consumption totals skips missing values"""
+        totals = convert_mscons_to_json(self.mscons_edi_data)['consumption_report']['consumption_totals']
+        assert sum_consumption(totals) == 2500.0
+        assert sum_consumption(totals + [{"qualifier": "220", "value": None}, {"value": 0.5}]) == 2500.5
+        assert sum_consumption([]) == 0.0
+    
+    def test_convert_mscons_to_soa(self):
+        """Test MSCONS quantities are collected column-wise across messages"""
+        empty_qty = dict(self.mscons_edi_data, QTY=['220', '', 'KWH'])
+        columns = convert_mscons_to_soa([self.mscons_edi_data, self.sample_edi_data, empty_qty])
+        
+        assert columns['message_reference'] == ['MSG002', 'MSG002']
+        assert columns['qualifier'] == ['220', '220']
+        assert columns['value'][0] == 2500.0
+        assert columns['value'][1] != columns['value'][1]  # NaN for a missing value
+        assert len(columns['metering_point']) == len(columns['unit']) == 2
+    
     def test_pretty_print_json_function(self):
         """Test JSON pretty printing function"""
         test_data = {"test": "data", "number": 123}
@@ -338,6 +405,20 @@ class TestConvenienceFunctions:
         assert isinstance(result_custom, str)
         # Should have more spaces with indent=4
         assert len(result_custom) >= len(result)
+    
+    def test_to_json_bytes_function(self):
+        """Test compact JSON encoding of converted data"""
+        result = convert_mscons_to_json(self.mscons_edi_data)
+        encoded = to_json_bytes(result)
+        
+        assert isinstance(encoded, bytes)
+        assert b'": ' not in encoded
+        assert json.loads(encoded) == json.loads(json.dumps(result))
+        
+        # Values without a JSON form are written as str(), big ints exactly
+        assert json.loads(to_json_bytes({"at": datetime(2025, 1, 3, 12, 0), "big": 2 ** 70})) == {
+            "at": "2025-01-03 12:00:00", "big": 2 ** 70
+        }
 
 
 class TestJSONValidator:
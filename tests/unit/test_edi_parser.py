@@ -0,0 +1,113 @@
+import sys
+import io
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pytest
+from src.services import edi_parser
+from src.services.edi_parser import EDIFACTParser, parse_decimal
+
+
+class TestSegmentSplitting:
+    """Test suite for splitting EDI content into segments"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.parser = EDIFACTParser()
+        self.content = "UNB+UNOC:3+SENDER+RECIPIENT'UNH+MSG001+MSCONS:D:04B'BGM+7+DOC?'123+9'QTY+220:1500.5:KWH'"
+    
+    def segments(self, stream):
+        """Parse a stream and return (tag, elements) pairs"""
+        return [(segment["tag"], segment["elements"]) for segment in self.parser.iter_segments(stream)]
+    
+    def test_escaped_segment_separator(self):
+        """Test ?' stays inside its segment instead of ending it"""
+        result = self.segments("BGM+7+DOC?'123+9'UNT+2+MSG001'")
+        assert result == [("BGM", ["7", "DOC?'123", "9"]), ("UNT", ["2", "MSG001"])]
+    
+    def test_escaped_escape_character(self):
+        """Test ?? is an escaped ? and the following ' still ends the segment"""
+        result = self.segments("BGM+7+DOC??'UNT+2+MSG001'")
+        assert result == [("BGM", ["7", "DOC??"]), ("UNT", ["2", "MSG001"])]
+    
+    def test_line_breaks_removed(self):
+        """Test CR/LF between and inside segments are stripped"""
+        expected = self.segments(self.content)
+        assert self.segments(self.content.replace("'", "'\r\n")) == expected
+        assert self.segments(self.content.replace("'", "'\n")) == expected
+        assert self.segments("UNB+UNOC:3+SEN\r\nDER'") == [("UNB", [["UNOC", "3"], "SENDER"])]
+    
+    def test_trailing_segment_without_terminator(self):
+        """Test a final segment without ' is still returned"""
+        result = self.segments("UNH+MSG001+MSCONS'UNT+2+MSG001")
+        assert result == [("UNH", ["MSG001", "MSCONS"]), ("UNT", ["2", "MSG001"])]
+        
+        chunks = ["UNH+MSG001+MSCONS'UN", "T+2+MSG001"]
+        assert self.segments(chunks) == result
+    
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+    def test_segments_split_across_chunks(self, chunk_size, monkeypatch):
+        """Test file input gives the same segments whatever the chunk boundaries"""
+        monkeypatch.setattr(edi_parser, "READ_CHUNK_SIZE", chunk_size)
+        content = self.content.replace("'", "'\r\n")
+        
+        assert self.segments(io.StringIO(content)) == self.segments(self.content)
+    
+    def test_escape_split_across_chunks(self):
+        """Test ?' is kept together when ? ends one chunk and ' starts the next"""
+        chunks = ["BGM+7+DOC?", "'123+9'UNT+2+MSG001'"]
+        result = self.segments(chunks)
+        assert result == [("BGM", ["7", "DOC?'123", "9"]), ("UNT", ["2", "MSG001"])]
+    
+    def test_line_break_split_across_chunks(self):
+        """Test a CR/LF pair split over two chunks is stripped"""
+        chunks = ["UNH+MSG001+MSCONS'\r", "\nUNT+2+MSG001'"]
+        assert self.segments(chunks) == [("UNH", ["MSG001", "MSCONS"]), ("UNT", ["2", "MSG001"])]
+
+
+class TestNumericValues:
+    """Test suite for EDIFACT numeric value parsing"""
+    
+    def test_parse_decimal(self):
+        """Test decimal point and decimal comma values"""
+        assert parse_decimal("1500.5") == 1500.5
+        assert parse_decimal("12,5") == 12.5
+        assert parse_decimal("-12") == -12.0
+    
+    def test_parse_decimal_invalid(self):
+        """Test empty, non-numeric and non-finite values give None"""
+        for value in (None, "", "abc", "nan", "inf", "-Infinity"):
+            assert parse_decimal(value) is None
+
+
+class TestReadingTimestamps:
+    """Test suite for the timestamps given to meter readings"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.parser = EDIFACTParser()
+        self.content = "UNB+UNOC:3+SENDER+RECIPIENT'UNH+MSG001+MSCONS:D:04B'BGM+7+DOC123+9'QTY+220:1500.5:KWH'"
+    
+    def test_structure_from_iter_segments(self):
+        """Test readings built without parse_edi_file still get a timestamp"""
+        message_data = self.parser._extract_message_structure(self.parser.iter_segments(self.content))
+        
+        readings = self.parser.extract_meter_readings(message_data)
+        assert readings[0]["timestamp"] is not None
+        assert readings[0]["timestamp"] == message_data["metadata"]["parsed_at"]
+    
+    def test_each_parse_has_own_timestamp(self):
+        """Test a reused parser does not carry a timestamp over between messages"""
+        first = self.parser._extract_message_structure(self.parser.iter_segments(self.content), "2025-01-01T00:00:00")
+        second = self.parser._extract_message_structure(self.parser.iter_segments(self.content), "2025-01-02T00:00:00")
+        
+        assert self.parser.extract_meter_readings(first)[0]["timestamp"] == "2025-01-01T00:00:00"
+        assert self.parser.extract_meter_readings(second)[0]["timestamp"] == "2025-01-02T00:00:00"
+    
+    def test_missing_reading_timestamp_falls_back(self):
+        """Test a reading whose timestamp is None gets the message timestamp"""
+        message_data = self.parser.parse_edi_file(self.content)
+        message_data["readings"][0]["timestamp"] = None
+        
+        readings = self.parser.extract_meter_readings(message_data)
+        assert readings[0]["timestamp"] == message_data["metadata"]["parsed_at"]